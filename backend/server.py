@@ -1,36 +1,394 @@
-from fastapi import FastAPI, APIRouter, File, UploadFile, HTTPException, Form
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, File, UploadFile, HTTPException, Form, Query, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from bson import Binary
+from pymongo import ReturnDocument, IndexModel, ASCENDING, DESCENDING, monitoring
+from prometheus_client import CONTENT_TYPE_LATEST, Counter as MetricCounter, Histogram, generate_latest
 import os
 import logging
+import logging.handlers
+import atexit
+import functools
+import queue
+import random
+import sys
+import threading
+from urllib.parse import parse_qs
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Optional, Dict, Any, Tuple, FrozenSet, AsyncIterator, Type, TypeVar
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict, deque
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 import PyPDF2
-import io
 import re
+import copy
+import hashlib
+import time
+import unicodedata
+import zlib
+import asyncio
+import tempfile
+import httpx
+import numpy as np
+import scipy.sparse as sparse
+import orjson
+import ahocorasick
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Prometheus metrics, served at /api/metrics
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "nextobjective_http_request_duration_seconds", "Time to fully send a response, streamed bodies included",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+LLM_CALL_SECONDS = Histogram(
+    "nextobjective_llm_call_duration_seconds", "LLM call duration after acquiring a concurrency slot",
+    ["purpose", "outcome"], buckets=LATENCY_BUCKETS
+)
+LLM_QUEUE_SECONDS = Histogram(
+    "nextobjective_llm_queue_duration_seconds", "Time spent waiting for an LLM concurrency slot",
+    ["purpose"], buckets=LATENCY_BUCKETS
+)
+LLM_TOKENS = Histogram(
+    "nextobjective_llm_tokens", "Tokens per LLM call as reported by the API",
+    ["purpose", "direction"], buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+)
+MONGO_OPERATION_SECONDS = Histogram(
+    "nextobjective_mongo_operation_duration_seconds", "MongoDB command duration as measured by the driver",
+    ["collection", "command", "outcome"], buckets=LATENCY_BUCKETS
+)
+PDF_EXTRACTION_SECONDS = Histogram(
+    "nextobjective_pdf_extraction_duration_seconds", "PDF text extraction time, pool queueing included",
+    ["outcome"], buckets=LATENCY_BUCKETS
+)
+PDF_PAGES = Histogram(
+    "nextobjective_pdf_pages", "Page count of extracted PDFs", buckets=(1, 2, 3, 5, 10, 20, 50)
+)
+FALLBACK_TOTAL = MetricCounter(
+    "nextobjective_fallback", "Requests answered by a fallback path instead of the primary one", ["path"]
+)
+LOG_RECORDS_DROPPED_TOTAL = MetricCounter(
+    "nextobjective_log_records_dropped", "Log records dropped because the log queue was full"
+)
+
+def observe_seconds(histogram: Histogram):
+    """Decorate a coroutine function to record its duration in histogram, labelled by outcome ok or error"""
+    def decorator(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await function(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                histogram.labels(outcome=outcome).observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+def counts_fallback(path: str):
+    """Decorate a fallback function to count how often it answers in place of the primary path"""
+    fallback_counter = FALLBACK_TOTAL.labels(path=path)
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            fallback_counter.inc()
+            return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Driver-level listener that times every MongoDB command per collection, however the query was issued"""
+
+    def __init__(self):
+        self._collections: Dict[Tuple[Any, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        collection = event.command.get(event.command_name)
+        # getMore names the cursor id, not the collection, in the command_name field
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        self._collections[(event.connection_id, event.request_id)] = collection if isinstance(collection, str) else "none"
+
+    def _observe(self, event, outcome: str):
+        collection = self._collections.pop((event.connection_id, event.request_id), "none")
+        MONGO_OPERATION_SECONDS.labels(collection, event.command_name, outcome).observe(event.duration_micros / 1e6)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._observe(event, "ok")
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._observe(event, "error")
+
+class RequestMetricsMiddleware:
+    """Plain ASGI middleware recording per-route latency; labels use the route template to bound cardinality"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; unmatched paths share one label
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route_path, str(status)).observe(time.perf_counter() - started)
+
+# Request profiling
+class RollingRateLimit:
+    """Allows at most max_events in any trailing window of window_seconds"""
+
+    def __init__(self, max_events: int, window_seconds: float = 60.0):
+        self.max_events = max_events
+        self.window_seconds = window_seconds
+        self._events: deque = deque()
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        while self._events and now - self._events[0] >= self.window_seconds:
+            self._events.popleft()
+        if len(self._events) >= self.max_events:
+            return False
+        self._events.append(now)
+        return True
+
+class StackSampler:
+    """Samples Python stacks from a background thread via sys._current_frames.
+
+    Stacks are aggregated as collapsed stacks ("thread;outer;...;inner count" lines), the input format of
+    flamegraph.pl and speedscope. The event loop thread is always sampled, so time it spent waiting on I/O shows
+    up as the selector. Other threads are only sampled while busy, which is where Motor and asyncio.to_thread
+    work appears. PDF parsing runs in worker processes, so it only shows up as the loop waiting.
+    """
+
+    # Innermost frames of a parked thread: a condition wait, a selector, or an executor worker awaiting work
+    IDLE_FRAMES = frozenset({("threading.py", "wait"), ("selectors.py", "select"), ("thread.py", "_worker")})
+
+    def __init__(self, interval_seconds: float, loop_thread_id: int):
+        self.interval_seconds = interval_seconds
+        self.loop_thread_id = loop_thread_id
+        self.samples: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._labels: Dict[Any, str] = {}
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval_seconds):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                code = frame.f_code
+                if thread_id != self.loop_thread_id and (os.path.basename(code.co_filename), code.co_name) in self.IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(thread_names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stopped.set()
+        self._thread.join()
+        return self.samples
+
+def write_collapsed_stacks(path: str, samples: Counter):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as profile_file:
+        for stack, count in samples.most_common():
+            profile_file.write(f"{stack} {count}\n")
+
+class ProfilingMiddleware:
+    """Runs selected requests under a StackSampler and writes the stacks to output_dir once the response is sent.
+
+    A request is selected when it asks with the X-Profile header or a profile query flag, within the
+    per-minute budget, or by the automatic rolling sample. Requests share the process, so a profile also
+    holds whatever else ran concurrently; profile a quiet instance for a clean picture.
+    """
+
+    HEADER = b"x-profile"
+
+    def __init__(self, app, output_dir: str, token: str, max_per_minute: int, sample_per_minute: int,
+                 interval_seconds: float):
+        self.app = app
+        self.output_dir = output_dir
+        self.token = token
+        self.interval_seconds = interval_seconds
+        self.requested = RollingRateLimit(max_per_minute)
+        self.sampled = RollingRateLimit(sample_per_minute)
+
+    def _flag(self, scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == self.HEADER:
+                return value.decode("latin-1")
+        query_string = scope["query_string"]
+        if b"profile" in query_string:
+            values = parse_qs(query_string.decode("latin-1")).get("profile")
+            if values:
+                return values[0]
+        return None
+
+    def _selected(self, scope) -> bool:
+        flag = self._flag(scope)
+        if flag is not None and flag not in ("", "0", "false"):
+            if self.token and flag != self.token:
+                return False
+            return self.requested.try_acquire()
+        return self.sampled.max_events > 0 and self.sampled.try_acquire()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        sampler = StackSampler(self.interval_seconds, threading.get_ident())
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            samples = sampler.stop()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            route_path = getattr(scope.get("route"), "path", scope["path"])
+            route_slug = re.sub(r"[^A-Za-z0-9]+", "_", route_path).strip("_") or "root"
+            path = os.path.join(self.output_dir, f"{profile_id}-{scope['method']}-{route_slug}-{elapsed_ms:.0f}ms.collapsed")
+            await asyncio.to_thread(write_collapsed_stacks, path, samples)
+            logger.info("Request profiled", extra={"fields": {"path": path, "samples": sum(samples.values()), "elapsed_ms": round(elapsed_ms)}})
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandMetrics()])
 db = client[os.environ['DB_NAME']]
 
 # Initialize LLM Chat
 ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY')
+LLM_PROVIDER = "anthropic"
+LLM_MODEL = "claude-3-5-sonnet-20241022"
+
+# LLM gateway configuration. LLM_BACKEND is "http" (pooled Messages API client) or "emergent" (LlmChat);
+# point LLM_BASE_URL at a local stub server for load tests.
+LLM_BACKEND = os.environ.get('LLM_BACKEND', 'http')
+LLM_BASE_URL = os.environ.get('LLM_BASE_URL', 'https://api.anthropic.com')
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', '8'))
+LLM_MAX_CONNECTIONS = int(os.environ.get('LLM_MAX_CONNECTIONS', '20'))
+LLM_TIMEOUT_SECONDS = float(os.environ.get('LLM_TIMEOUT_SECONDS', '60'))
+LLM_MAX_TOKENS = int(os.environ.get('LLM_MAX_TOKENS', '2048'))
+
+# Bump whenever the resume analysis prompt changes so cached results are not reused
+RESUME_ANALYSIS_PROMPT_VERSION = "1"
+
+# Resume analysis cache configuration
+RESUME_CACHE_MAX_ENTRIES = int(os.environ.get('RESUME_CACHE_MAX_ENTRIES', '1024'))
+RESUME_CACHE_TTL_SECONDS = int(os.environ.get('RESUME_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+
+# PDF extraction configuration
+PDF_POOL_SIZE = int(os.environ.get('PDF_POOL_SIZE', '2'))
+PDF_MAX_QUEUE = int(os.environ.get('PDF_MAX_QUEUE', '8'))
+PDF_EXTRACT_TIMEOUT_SECONDS = float(os.environ.get('PDF_EXTRACT_TIMEOUT_SECONDS', '20'))
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', '20'))
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+# Resume text beyond this many characters never makes it into an LLM prompt
+RESUME_TEXT_CHAR_BUDGET = int(os.environ.get('RESUME_TEXT_CHAR_BUDGET', '24000'))
+
+# Resume analysis job queue configuration
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', '4'))
+ANALYSIS_JOB_MAX_ATTEMPTS = int(os.environ.get('ANALYSIS_JOB_MAX_ATTEMPTS', '3'))
+ANALYSIS_JOB_VISIBILITY_TIMEOUT_SECONDS = float(os.environ.get('ANALYSIS_JOB_VISIBILITY_TIMEOUT_SECONDS', '180'))
+ANALYSIS_JOB_RETRY_BACKOFF_SECONDS = float(os.environ.get('ANALYSIS_JOB_RETRY_BACKOFF_SECONDS', '5'))
+ANALYSIS_JOB_POLL_INTERVAL_SECONDS = float(os.environ.get('ANALYSIS_JOB_POLL_INTERVAL_SECONDS', '1'))
+ANALYSIS_JOB_STREAM_TIMEOUT_SECONDS = float(os.environ.get('ANALYSIS_JOB_STREAM_TIMEOUT_SECONDS', '300'))
+
+# Uploads get the local analysis at once; an LLM result that arrives later than this after upload is discarded
+ANALYSIS_REFINEMENT_DEADLINE_SECONDS = float(os.environ.get('ANALYSIS_REFINEMENT_DEADLINE_SECONDS', '120'))
+# A streaming upload keeps its refinement job hidden from the workers for this long past its last heartbeat
+ANALYSIS_STREAM_HOLD_SECONDS = float(os.environ.get('ANALYSIS_STREAM_HOLD_SECONDS', '15'))
+
+# Batch career scoring: paths per LLM prompt, and the most paths one request may score
+CAREER_SCORE_PATHS_PER_PROMPT = int(os.environ.get('CAREER_SCORE_PATHS_PER_PROMPT', '6'))
+CAREER_SCORE_BATCH_MAX_PATHS = int(os.environ.get('CAREER_SCORE_BATCH_MAX_PATHS', '30'))
+
+# Job listings: how many career paths keep their generated listings in memory
+JOB_LISTING_CACHE_MAX_ENTRIES = int(os.environ.get('JOB_LISTING_CACHE_MAX_ENTRIES', '256'))
+
+# Job search index: loaded from JOB_INDEX_PATH at startup, or built from the JSONL feed at JOB_FEED_PATH when no index file exists
+JOB_INDEX_PATH = os.environ.get('JOB_INDEX_PATH', str(ROOT_DIR / 'data' / 'job_index.npz'))
+JOB_FEED_PATH = os.environ.get('JOB_FEED_PATH', '')
+JOB_SEARCH_DEFAULT_LIMIT = int(os.environ.get('JOB_SEARCH_DEFAULT_LIMIT', '10'))
+JOB_SEARCH_MAX_LIMIT = int(os.environ.get('JOB_SEARCH_MAX_LIMIT', '50'))
+
+# Static catalogs (survey questions, career paths) may be cached by browsers and proxies for this long
+CATALOG_MAX_AGE_SECONDS = int(os.environ.get('CATALOG_MAX_AGE_SECONDS', str(24 * 3600)))
+
+# Fail startup if any hot query is not served by an index
+MONGO_VERIFY_QUERY_PLANS = os.environ.get('MONGO_VERIFY_QUERY_PLANS', 'false').lower() == 'true'
+
+# Logging: records are handed to a background thread; large payloads are sampled and truncated
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')  # text or json
+LOG_QUEUE_MAX_RECORDS = int(os.environ.get('LOG_QUEUE_MAX_RECORDS', '10000'))
+LOG_PAYLOAD_SAMPLE_RATE = float(os.environ.get('LOG_PAYLOAD_SAMPLE_RATE', '0.01'))
+LOG_PAYLOAD_MAX_CHARS = int(os.environ.get('LOG_PAYLOAD_MAX_CHARS', '512'))
+
+# Opt-in request profiling: with PROFILING_ENABLED, requests sending the X-Profile header or a profile=1 query
+# flag are sampled, and PROFILING_SAMPLE_PER_MINUTE more are picked automatically; off, the middleware is absent
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN', '')  # when set, the header or flag must carry this value
+PROFILING_DIR = os.environ.get('PROFILING_DIR', str(ROOT_DIR / 'profiles'))
+PROFILING_MAX_PER_MINUTE = int(os.environ.get('PROFILING_MAX_PER_MINUTE', '5'))
+PROFILING_SAMPLE_PER_MINUTE = int(os.environ.get('PROFILING_SAMPLE_PER_MINUTE', '0'))
+PROFILING_INTERVAL_SECONDS = float(os.environ.get('PROFILING_INTERVAL_SECONDS', '0.005'))
 
 # Create the main app without a prefix
 app = FastAPI()
 
-# Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
+# Create a router with the /api prefix; responses are serialized with orjson
+api_router = APIRouter(prefix="/api", default_response_class=ORJSONResponse)
 
 # Career paths master list
 CAREER_PATHS = [
@@ -45,6 +403,78 @@ CAREER_PATHS = [
     "Training Specialist"
 ]
 
+# Career preference survey
+SURVEY_QUESTIONS = [
+    {
+        "id": 1,
+        "question": "What type of work environment do you prefer?",
+        "type": "multiple_choice",
+        "options": ["Remote", "Office", "Hybrid", "Flexible"]
+    },
+    {
+        "id": 2,
+        "question": "How important is work-life balance to you?",
+        "type": "scale",
+        "min": 1,
+        "max": 5,
+        "labels": ["Not important", "Very important"]
+    },
+    {
+        "id": 3,
+        "question": "What is your preferred company size?",
+        "type": "multiple_choice",
+        "options": ["Startup (1-50)", "Small (51-200)", "Medium (201-1000)", "Large (1000+)"]
+    },
+    {
+        "id": 4,
+        "question": "How comfortable are you with public speaking?",
+        "type": "scale",
+        "min": 1,
+        "max": 5,
+        "labels": ["Very uncomfortable", "Very comfortable"]
+    },
+    {
+        "id": 5,
+        "question": "Do you prefer working independently or in teams?",
+        "type": "multiple_choice",
+        "options": ["Independently", "In teams", "Mix of both"]
+    },
+    {
+        "id": 6,
+        "question": "What motivates you most in your career?",
+        "type": "multiple_choice",
+        "options": ["Financial growth", "Personal growth", "Impact on others", "Creative expression"]
+    },
+    {
+        "id": 7,
+        "question": "How important is job security to you?",
+        "type": "scale",
+        "min": 1,
+        "max": 5,
+        "labels": ["Not important", "Very important"]
+    },
+    {
+        "id": 8,
+        "question": "What industry interests you most?",
+        "type": "multiple_choice",
+        "options": ["Technology", "Healthcare", "Finance", "Education", "Marketing", "Other"]
+    },
+    {
+        "id": 9,
+        "question": "How willing are you to relocate for work?",
+        "type": "scale",
+        "min": 1,
+        "max": 5,
+        "labels": ["Not willing", "Very willing"]
+    },
+    {
+        "id": 10,
+        "question": "What is your ideal career timeline?",
+        "type": "multiple_choice",
+        "options": ["Immediate transition", "6 months", "1 year", "2+ years"]
+    }
+]
+
 # Pydantic Models
 class ResumeAnalysisRequest(BaseModel):
     resume_text: str
@@ -62,6 +492,8 @@ class ResumeAnalysisResponse(BaseModel):
     career_suggestions: List[CareerSuggestion]
     extracted_skills: List[str]
     experience_level: str
+    resume_text_hash: Optional[str] = None
+    analysis_tier: str = "llm"  # local (offline analyzer), llm, or survey_local / survey_llm once survey-enhanced
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 class User(BaseModel):
@@ -85,6 +517,34 @@ class CareerScore(BaseModel):
     recommendations: List[str]
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
+class CareerScoreBatchRequest(BaseModel):
+    user_id: str
+    career_paths: List[str]
+
+# Shapes the LLM is prompted to reply with, validated straight from the reply text
+class ResumeAnalysisPayload(BaseModel):
+    career_suggestions: List[CareerSuggestion]
+    extracted_skills: List[str]
+    experience_level: str
+
+class SurveyCareerSuggestion(CareerSuggestion):
+    preference_match: Optional[str] = "Good alignment with stated preferences"
+
+class SurveyAnalysisPayload(ResumeAnalysisPayload):
+    career_suggestions: List[SurveyCareerSuggestion]
+
+class CareerScorePayload(BaseModel):
+    current_score: float
+    skill_gaps: List[str]
+    strength_areas: List[str]
+    recommendations: List[str]
+
+class CareerScoreBatchEntry(CareerScorePayload):
+    career_path: str
+
+class CareerScoreBatchPayload(BaseModel):
+    scores: List[CareerScoreBatchEntry]
+
 class ProgressLog(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str
@@ -111,29 +571,652 @@ class JobListing(BaseModel):
     career_path: str
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
+class ScoredJobListing(JobListing):
+    score: float
+
+class JobSearchResponse(BaseModel):
+    jobs: List[ScoredJobListing]
+    indexed_jobs: int
+
+class AnalysisJob(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    status: str = "queued"  # queued, running, done, failed
+    resume_text_hash: str
+    attempts: int = 0
+    max_attempts: int = ANALYSIS_JOB_MAX_ATTEMPTS
+    visible_at: datetime = Field(default_factory=datetime.utcnow)
+    analysis_id: Optional[str] = None
+    deadline_at: Optional[datetime] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class AnalysisJobStatus(BaseModel):
+    job_id: str
+    status: str
+    attempts: int
+    analysis: Optional[ResumeAnalysisResponse] = None
+    error: Optional[str] = None
+
+class ResumeUploadResponse(BaseModel):
+    analysis: ResumeAnalysisResponse
+    job_id: str
+    status: str
+    status_url: str
+    events_url: str
+
+# Lean response models: only the fields the frontend reads
+class CareerScoreBatchResponse(BaseModel):
+    scores: List[CareerScore]
+
+class ProgressLogEntry(BaseModel):
+    id: str
+    career_path: str
+    log_entry: str
+    activities_completed: List[str]
+    skills_improved: List[str]
+    timestamp: datetime
+
+class UserProgressResponse(BaseModel):
+    career_score: Optional[CareerScore] = None
+    recent_logs: List[ProgressLogEntry]
+
+class AnalysisSummary(BaseModel):
+    id: str
+    career_suggestions: List[CareerSuggestion]
+    extracted_skills: List[str]
+    experience_level: str
+    timestamp: datetime
+
+class SurveySummary(BaseModel):
+    responses: Dict[str, Any]
+    timestamp: datetime
+
+class DashboardResponse(BaseModel):
+    analysis: Optional[AnalysisSummary] = None
+    survey: Optional[SurveySummary] = None
+    career_score: Optional[CareerScore] = None
+    recent_logs: List[ProgressLogEntry]
+    selected_career_path: Optional[str] = None
+
 # Helper function to extract text from PDF
-async def extract_text_from_pdf(file_content: bytes) -> str:
+def iter_pdf_page_text(pdf_reader: PyPDF2.PdfReader):
+    """Yield the text of each page lazily so callers can stop as soon as they have enough"""
+    for page in pdf_reader.pages:
+        yield page.extract_text() or ""
+
+def collect_text(chunks, max_chars: int) -> str:
+    """Gather text chunks until the character budget is reached, joining them once at the end"""
+    parts = []
+    total = 0
+    for chunk in chunks:
+        parts.append(chunk)
+        total += len(chunk)
+        if total >= max_chars:
+            break
+    return "".join(parts)[:max_chars]
+
+def _extract_pdf_text_sync(pdf_path: str, max_pages: int, max_chars: int) -> Tuple[str, int]:
+    """Runs inside a worker process, so it must stay a picklable module-level function; returns (text, page count)"""
+    with open(pdf_path, "rb") as pdf_file:
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        page_count = len(pdf_reader.pages)
+        if page_count > max_pages:
+            raise ValueError(f"PDF has {page_count} pages, at most {max_pages} are supported")
+        return collect_text(iter_pdf_page_text(pdf_reader), max_chars).strip(), page_count
+
+class PdfExtractionPool:
+    """Bounded process pool that keeps PyPDF2 parsing off the event loop"""
+
+    def __init__(self, max_workers: int, max_queue: int, timeout_seconds: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned, not forked: this process already runs Motor's monitor threads and the log listener thread
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def _terminate(self, executor: ProcessPoolExecutor):
+        """Kill the pool's workers; one stuck in a PyPDF2 loop never returns, and would hold its slot forever"""
+        if self._executor is not executor:
+            # Another extraction that timed out on this pool has already killed it
+            return
+        self._executor = None
+        # ProcessPoolExecutor has no public way to stop a running task, so the worker processes are terminated
+        for process in list(executor._processes.values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, future: asyncio.Future):
+        self._in_flight -= 1
+        # Nobody awaits a timed-out extraction any more; retrieve its outcome so asyncio does not log it as lost
+        if not future.cancelled():
+            future.exception()
+
+    async def extract(self, pdf_path: str, max_pages: int, max_chars: int) -> Tuple[str, int]:
+        # Back-pressure: refuse work instead of letting uploads queue up behind a busy pool
+        if self._in_flight >= self.max_workers + self.max_queue:
+            raise HTTPException(
+                status_code=503,
+                detail="PDF processing is at capacity, please retry shortly",
+                headers={"Retry-After": "5"}
+            )
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        future = loop.run_in_executor(executor, _extract_pdf_text_sync, pdf_path, max_pages, max_chars)
+        self._in_flight += 1
+        # Capacity is only released once the worker is really done, or killed below
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            # The next extraction gets a fresh pool; extractions sharing the killed one fail with BrokenProcessPool
+            self._terminate(executor)
+            raise
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+pdf_extraction_pool = PdfExtractionPool(PDF_POOL_SIZE, PDF_MAX_QUEUE, PDF_EXTRACT_TIMEOUT_SECONDS)
+
+@observe_seconds(PDF_EXTRACTION_SECONDS)
+async def extract_text_from_pdf(pdf_path: str) -> str:
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text.strip()
+        text, page_count = await pdf_extraction_pool.extract(pdf_path, PDF_MAX_PAGES, RESUME_TEXT_CHAR_BUDGET)
+        PDF_PAGES.observe(page_count)
+        return text
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out extracting text from PDF")
+    except BrokenProcessPool:
+        # Another upload's extraction timed out and took down the worker this one was running on
+        raise HTTPException(status_code=503, detail="PDF processing was interrupted, please retry", headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error extracting text from PDF: {str(e)}")
 
-# AI helper function
-async def analyze_resume_with_ai(resume_text: str) -> Dict[str, Any]:
+async def spool_upload(file: UploadFile, suffix: str) -> str:
+    """Stream an upload to a temporary file in chunks, enforcing the size limit as it goes"""
+    spool = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
     try:
-        print(f"Starting AI analysis for resume: {resume_text[:100]}...")
-        
+        with spool:
+            written = 0
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                written += len(chunk)
+                if written > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail=f"File exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB upload limit")
+                spool.write(chunk)
+        return spool.name
+    except BaseException:
+        os.unlink(spool.name)
+        raise
+
+async def extract_resume_text(file: UploadFile) -> str:
+    """Extract resume text from an uploaded PDF or TXT file without holding the whole upload in memory"""
+    is_pdf = file.filename.lower().endswith('.pdf')
+    spool_path = await spool_upload(file, '.pdf' if is_pdf else '.txt')
+    try:
+        if is_pdf:
+            return await extract_text_from_pdf(spool_path)
+        with open(spool_path, encoding='utf-8') as text_file:
+            return text_file.read(RESUME_TEXT_CHAR_BUDGET)
+    finally:
+        os.unlink(spool_path)
+
+# Resume analysis cache
+def normalize_resume_text(resume_text: str) -> str:
+    """Normalize extracted resume text so re-uploads of the same file hash identically"""
+    return " ".join(unicodedata.normalize("NFKC", resume_text).split())
+
+def resume_analysis_cache_key(resume_text: str) -> str:
+    """Content-addressed cache key over the normalized text, model and prompt version"""
+    digest = hashlib.sha256()
+    for part in (LLM_PROVIDER, LLM_MODEL, RESUME_ANALYSIS_PROMPT_VERSION, normalize_resume_text(resume_text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+class ResumeAnalysisCache:
+    """Two-tier cache for LLM resume analyses: an in-process LRU in front of a MongoDB collection"""
+
+    def __init__(self, collection, max_entries: int, ttl_seconds: int):
+        self.collection = collection
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.counters = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+
+    def _remember(self, key: str, result: Dict[str, Any]):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return copy.deepcopy(result)
+            del self._entries[key]
+
+        try:
+            doc = await self.collection.find_one(
+                {"key": key, "expires_at": {"$gt": datetime.utcnow()}},
+                projection={"_id": 0, "result": 1}
+            )
+        except Exception as e:
+            logger.warning("Resume analysis cache lookup failed", extra={"fields": {"error": repr(e)}})
+            self.counters["errors"] += 1
+            doc = None
+
+        if doc:
+            self._remember(key, doc["result"])
+            self.counters["persistent_hits"] += 1
+            return copy.deepcopy(doc["result"])
+
+        self.counters["misses"] += 1
+        return None
+
+    async def set(self, key: str, result: Dict[str, Any]):
+        result = copy.deepcopy(result)
+        self._remember(key, result)
+        now = datetime.utcnow()
+        try:
+            await self.collection.update_one(
+                {"key": key},
+                {"$set": {
+                    "key": key,
+                    "result": result,
+                    "model": LLM_MODEL,
+                    "prompt_version": RESUME_ANALYSIS_PROMPT_VERSION,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl_seconds)
+                }},
+                upsert=True
+            )
+            self.counters["writes"] += 1
+        except Exception as e:
+            logger.warning("Resume analysis cache write failed", extra={"fields": {"error": repr(e)}})
+            self.counters["errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.counters["memory_hits"] + self.counters["persistent_hits"]
+        lookups = hits + self.counters["misses"]
+        return {
+            **self.counters,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
+
+resume_analysis_cache = ResumeAnalysisCache(db.resume_analysis_cache, RESUME_CACHE_MAX_ENTRIES, RESUME_CACHE_TTL_SECONDS)
+
+# Resume text store
+class ResumeTextStore:
+    """Content-addressed store for extracted resume text, compressed with zlib and written once per distinct text"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    @staticmethod
+    def content_hash(resume_text: str) -> str:
+        return hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+
+    async def put(self, resume_text: str) -> str:
+        text_hash = self.content_hash(resume_text)
+        # $setOnInsert makes re-uploads of the same text (by any user) a no-op
+        await self.collection.update_one(
+            {"_id": text_hash},
+            {"$setOnInsert": {
+                "data": Binary(zlib.compress(resume_text.encode("utf-8"), 6)),
+                "encoding": "zlib",
+                "length": len(resume_text),
+                "created_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+        return text_hash
+
+    async def get(self, text_hash: str) -> Optional[str]:
+        doc = await self.collection.find_one({"_id": text_hash}, projection={"data": 1})
+        if not doc:
+            return None
+        return zlib.decompress(doc["data"]).decode("utf-8")
+
+resume_text_store = ResumeTextStore(db.resume_texts)
+
+async def load_resume_text(analysis: Dict[str, Any]) -> str:
+    """Full resume text behind an analysis, or a skills summary for analyses stored before texts were kept"""
+    text_hash = analysis.get("resume_text_hash")
+    if text_hash:
+        resume_text = await resume_text_store.get(text_hash)
+        if resume_text is not None:
+            return resume_text
+    return f"Skills: {', '.join(analysis['extracted_skills'])}\nExperience Level: {analysis['experience_level']}"
+
+# Shared LLM gateway
+class LlmGateway:
+    """Module-wide entry point for LLM calls: one pooled HTTP client, bounded concurrency and latency metrics"""
+
+    LATENCY_WINDOW = 512
+
+    def __init__(self, backend: str, base_url: str, api_key: Optional[str], max_concurrency: int,
+                 max_connections: int, timeout_seconds: float):
+        self.backend = backend
+        self.base_url = base_url
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.timeout_seconds = timeout_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._in_flight = 0
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                headers={
+                    "x-api-key": self.api_key or "",
+                    "anthropic-version": "2023-06-01",
+                    "content-type": "application/json"
+                }
+            )
+        return self._client
+
+    @staticmethod
+    def _record_usage(purpose: str, usage: Dict[str, Any]):
+        for direction in ("input", "output"):
+            if f"{direction}_tokens" in usage:
+                LLM_TOKENS.labels(purpose, direction).observe(usage[f"{direction}_tokens"])
+
+    async def _complete_http(self, system_message: str, prompt: str, purpose: str) -> str:
+        response = await self._get_client().post("/v1/messages", json={
+            "model": LLM_MODEL,
+            "max_tokens": LLM_MAX_TOKENS,
+            "system": system_message,
+            "messages": [{"role": "user", "content": prompt}]
+        })
+        response.raise_for_status()
+        payload = response.json()
+        self._record_usage(purpose, payload.get("usage", {}))
+        return "".join(block.get("text", "") for block in payload.get("content", []) if block.get("type") == "text")
+
+    async def _stream_http(self, system_message: str, prompt: str, purpose: str) -> AsyncIterator[str]:
+        async with self._get_client().stream("POST", "/v1/messages", json={
+            "model": LLM_MODEL,
+            "max_tokens": LLM_MAX_TOKENS,
+            "system": system_message,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": True
+        }) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                event = orjson.loads(line[5:])
+                if event.get("type") == "content_block_delta" and event["delta"].get("type") == "text_delta":
+                    yield event["delta"]["text"]
+                elif event.get("type") == "message_start":
+                    # Input tokens arrive up front, output tokens with the closing message_delta
+                    usage = event.get("message", {}).get("usage", {})
+                    self._record_usage(purpose, {"input_tokens": usage["input_tokens"]} if "input_tokens" in usage else {})
+                elif event.get("type") == "message_delta":
+                    self._record_usage(purpose, event.get("usage", {}))
+                elif event.get("type") == "error":
+                    raise RuntimeError(event.get("error", {}).get("message", "LLM stream error"))
+
+    async def _complete_emergent(self, system_message: str, prompt: str) -> str:
+        # LlmChat keeps per-session history, so it cannot be shared between calls
         chat = LlmChat(
-            api_key=ANTHROPIC_API_KEY,
+            api_key=self.api_key,
             session_id=str(uuid.uuid4()),
-            system_message="You are a career counselor and resume analysis expert. Analyze resumes and provide career suggestions based on skills, experience, and background."
-        ).with_model("anthropic", "claude-3-5-sonnet-20241022")
+            system_message=system_message
+        ).with_model(LLM_PROVIDER, LLM_MODEL)
+        return str(await chat.send_message(UserMessage(text=prompt)))
 
-        prompt = f"""
+    def _record(self, purpose: str, queue_seconds: float, call_seconds: float, failed: bool):
+        metrics = self._metrics.get(purpose)
+        if metrics is None:
+            metrics = self._metrics[purpose] = {
+                "calls": 0,
+                "errors": 0,
+                "queue_seconds_total": 0.0,
+                "call_seconds_total": 0.0,
+                "latencies": deque(maxlen=self.LATENCY_WINDOW)
+            }
+        metrics["calls"] += 1
+        metrics["errors"] += int(failed)
+        metrics["queue_seconds_total"] += queue_seconds
+        metrics["call_seconds_total"] += call_seconds
+        metrics["latencies"].append(call_seconds)
+        LLM_QUEUE_SECONDS.labels(purpose).observe(queue_seconds)
+        LLM_CALL_SECONDS.labels(purpose, "error" if failed else "ok").observe(call_seconds)
+
+    async def complete(self, system_message: str, prompt: str, purpose: str = "default") -> str:
+        queued_at = time.perf_counter()
+        async with self._semaphore:
+            started_at = time.perf_counter()
+            self._in_flight += 1
+            failed = True
+            try:
+                if self.backend == "emergent":
+                    text = await self._complete_emergent(system_message, prompt)
+                else:
+                    text = await self._complete_http(system_message, prompt, purpose)
+                failed = False
+                return text
+            finally:
+                self._in_flight -= 1
+                self._record(purpose, started_at - queued_at, time.perf_counter() - started_at, failed)
+
+    async def stream(self, system_message: str, prompt: str, purpose: str = "default") -> AsyncIterator[str]:
+        """Yield the reply text as it is generated; the concurrency slot is held until the stream ends"""
+        queued_at = time.perf_counter()
+        async with self._semaphore:
+            started_at = time.perf_counter()
+            self._in_flight += 1
+            failed = True
+            try:
+                if self.backend == "emergent":
+                    # LlmChat has no streaming interface, so the whole reply arrives as one chunk
+                    yield await self._complete_emergent(system_message, prompt)
+                else:
+                    async for text in self._stream_http(system_message, prompt, purpose):
+                        yield text
+                failed = False
+            finally:
+                self._in_flight -= 1
+                self._record(purpose, started_at - queued_at, time.perf_counter() - started_at, failed)
+
+    def stats(self) -> Dict[str, Any]:
+        per_purpose = {}
+        for purpose, metrics in self._metrics.items():
+            latencies = sorted(metrics["latencies"])
+            calls = metrics["calls"]
+            per_purpose[purpose] = {
+                "calls": calls,
+                "errors": metrics["errors"],
+                "mean_queue_seconds": metrics["queue_seconds_total"] / calls,
+                "mean_call_seconds": metrics["call_seconds_total"] / calls,
+                "p50_call_seconds": latencies[len(latencies) // 2],
+                "p95_call_seconds": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                "max_call_seconds": latencies[-1]
+            }
+        return {
+            "backend": self.backend,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "purposes": per_purpose
+        }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+llm_gateway = LlmGateway(LLM_BACKEND, LLM_BASE_URL, ANTHROPIC_API_KEY, LLM_MAX_CONCURRENCY, LLM_MAX_CONNECTIONS, LLM_TIMEOUT_SECONDS)
+
+class SingleFlight:
+    """Coalesce concurrent calls sharing a key into one execution whose result every caller awaits"""
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.counters = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    async def do(self, key: str, call):
+        self.counters["calls"] += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.counters["executions"] += 1
+        else:
+            self.counters["coalesced"] += 1
+        # Shielded so one caller disconnecting does not cancel the call for everyone else
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Future):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "in_flight": len(self._in_flight)}
+
+llm_single_flight = SingleFlight()
+
+async def complete_coalesced(system_message: str, prompt: str, purpose: str) -> str:
+    """Send a prompt through the gateway, sharing one upstream call among identical concurrent prompts"""
+    fingerprint = hashlib.sha256("\0".join((purpose, system_message, prompt)).encode("utf-8")).hexdigest()
+    return await llm_single_flight.do(fingerprint, lambda: llm_gateway.complete(system_message, prompt, purpose=purpose))
+
+# Payload logging
+def truncate_for_log(text: str, max_chars: int = LOG_PAYLOAD_MAX_CHARS) -> str:
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} more chars]"
+
+def log_payload(event: str, payload: str, **fields):
+    """Log a truncated copy of a resume or LLM reply for a sampled fraction of calls, at DEBUG level"""
+    if LOG_PAYLOAD_SAMPLE_RATE <= 0 or not logger.isEnabledFor(logging.DEBUG) or random.random() >= LOG_PAYLOAD_SAMPLE_RATE:
+        return
+    logger.debug(event, extra={"fields": {**fields, "payload_chars": len(payload), "payload": truncate_for_log(payload)}})
+
+# Structured LLM output
+PayloadModel = TypeVar("PayloadModel", bound=BaseModel)
+
+JSON_STRUCTURE_PATTERN = re.compile(r'[{}"]')
+JSON_STRING_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+
+class LlmOutputError(ValueError):
+    """The LLM reply holds no JSON object that validates against the expected payload model"""
+
+def iter_json_object_spans(text: str):
+    """Yield (start, end) of every brace-balanced object in text, outermost first, skipping braces inside strings.
+
+    The first span is the first "{" to the last "}", which is the whole reply when the model followed the
+    prompt; if that does not validate, the balanced scan takes over. It jumps between structural characters
+    with a regex instead of stepping through every character. An opening brace that is never closed (prose
+    such as "{see below") is skipped and scanning resumes at the next one.
+    """
+    start = text.find("{")
+    if start == -1:
+        return
+    whole = (start, text.rfind("}") + 1)
+    if whole[1] > start:
+        yield whole
+    while start != -1:
+        depth, position, end = 0, start, -1
+        while True:
+            match = JSON_STRUCTURE_PATTERN.search(text, position)
+            if match is None:
+                break
+            char = match.group()
+            if char == '"':
+                string = JSON_STRING_PATTERN.match(text, match.start())
+                if string is None:
+                    break
+                position = string.end()
+                continue
+            position = match.end()
+            depth += 1 if char == "{" else -1
+            if depth == 0:
+                end = position
+                break
+        if end != -1 and (start, end) != whole:
+            yield start, end
+        start = text.find("{", start + 1)
+
+class StructuredOutputParser:
+    """Validates LLM replies into payload models and counts, per purpose, how often that fails.
+
+    Candidates are tried in order and the first object that validates wins, so a stray brace or a JSON
+    example in surrounding prose costs an extra attempt instead of the whole reply.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    def parse(self, text: str, model: Type[PayloadModel], purpose: str) -> PayloadModel:
+        metrics = self._metrics.get(purpose)
+        if metrics is None:
+            metrics = self._metrics[purpose] = {"parsed": 0, "recovered": 0, "failed": 0}
+        attempts = 0
+        for start, end in iter_json_object_spans(text):
+            attempts += 1
+            try:
+                payload = model.model_validate_json(text[start:end])
+            except ValidationError:
+                continue
+            metrics["parsed"] += 1
+            metrics["recovered"] += int(attempts > 1)
+            return payload
+        metrics["failed"] += 1
+        reason = "no JSON object" if attempts == 0 else f"none of {attempts} JSON objects matched"
+        logger.warning("Unparseable LLM reply", extra={"fields": {
+            "purpose": purpose, "model": model.__name__, "reason": reason, "reply_chars": len(text),
+            "reply": truncate_for_log(text)
+        }})
+        raise LlmOutputError(f"{model.__name__} not found in {purpose} reply: {reason}")
+
+    def stats(self) -> Dict[str, Any]:
+        per_purpose = {}
+        for purpose, metrics in self._metrics.items():
+            total = metrics["parsed"] + metrics["failed"]
+            per_purpose[purpose] = {**metrics, "failure_rate": metrics["failed"] / total if total else 0.0}
+        return per_purpose
+
+structured_output_parser = StructuredOutputParser()
+
+# AI helper function
+RESUME_ANALYSIS_SYSTEM_MESSAGE = "You are a career counselor and resume analysis expert. Analyze resumes and provide career suggestions based on skills, experience, and background."
+
+def build_resume_analysis_prompt(resume_text: str) -> str:
+    return f"""
         Analyze this resume and provide career suggestions:
 
         {resume_text}
@@ -167,67 +1250,384 @@ async def analyze_resume_with_ai(resume_text: str) -> Dict[str, Any]:
         IMPORTANT: Provide exactly 3 career suggestions ranked by match score (0.0-1.0). Consider the person's background, skills, and experience. Return ONLY valid JSON.
         """
 
-        user_message = UserMessage(text=prompt)
-        print("Sending message to Claude API...")
-        response = await chat.send_message(user_message)
-        print(f"Received response from Claude: {str(response)[:200]}...")
-        
-        # Parse the AI response
-        import json
-        response_text = str(response)
-        print(f"Full response text: {response_text}")
-        
-        # Find JSON in the response
-        start_idx = response_text.find('{')
-        end_idx = response_text.rfind('}') + 1
-        
-        if start_idx != -1 and end_idx != 0:
-            json_str = response_text[start_idx:end_idx]
-            print(f"Extracted JSON: {json_str}")
-            result = json.loads(json_str)
-            print(f"Parsed result: {result}")
-            return result
-        else:
-            print("Could not find JSON in response")
-            raise ValueError("No JSON found in response")
-        
+async def analyze_resume_with_llm(resume_text: str) -> Dict[str, Any]:
+    """LLM resume analysis with no fallback: raises when the model call or its JSON fails"""
+    # Identical resumes skip the LLM round trip entirely
+    cache_key = resume_analysis_cache_key(resume_text)
+    cached_result = await resume_analysis_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+
+    try:
+        response = str(await complete_coalesced(RESUME_ANALYSIS_SYSTEM_MESSAGE, build_resume_analysis_prompt(resume_text), purpose="resume_analysis"))
+        log_payload("LLM reply", response, purpose="resume_analysis", resume_chars=len(resume_text))
+        result = structured_output_parser.parse(response, ResumeAnalysisPayload, purpose="resume_analysis").model_dump()
+        # Only genuine LLM results are cached; fallbacks are cheap and should not mask recovery
+        await resume_analysis_cache.set(cache_key, result)
+        return result
     except Exception as e:
-        print(f"AI analysis error: {e}")
-        # Intelligent fallback based on resume content
-        return generate_intelligent_fallback(resume_text)
+        logger.warning("AI analysis failed", extra={"fields": {"purpose": "resume_analysis", "error": repr(e)}})
+        raise
 
-def generate_intelligent_fallback(resume_text: str) -> Dict[str, Any]:
-    """Generate intelligent career suggestions based on resume content analysis"""
-    resume_lower = resume_text.lower()
-    
-    # Analyze resume content for keywords
-    tech_keywords = ["software", "developer", "programming", "python", "javascript", "react", "coding", "technical", "engineer", "development"]
-    business_keywords = ["management", "business", "analyst", "strategy", "operations", "project", "marketing", "sales"]
-    creative_keywords = ["design", "creative", "marketing", "content", "writing", "visual", "graphic", "ux", "ui"]
-    data_keywords = ["data", "analytics", "analysis", "statistics", "research", "science", "machine learning", "ai"]
-    leadership_keywords = ["lead", "manager", "director", "team", "leadership", "supervisor", "coordinator"]
-    
-    # Count keyword matches
-    tech_score = sum(1 for keyword in tech_keywords if keyword in resume_lower)
-    business_score = sum(1 for keyword in business_keywords if keyword in resume_lower)
-    creative_score = sum(1 for keyword in creative_keywords if keyword in resume_lower)
-    data_score = sum(1 for keyword in data_keywords if keyword in resume_lower)
-    leadership_score = sum(1 for keyword in leadership_keywords if keyword in resume_lower)
-    
-    # Determine experience level
-    years_match = re.search(r'(\d+)\s*(?:years?|yrs?)', resume_lower)
-    if years_match:
-        years = int(years_match.group(1))
+# Keyword tables for the offline fallback analysis
+FALLBACK_KEYWORD_CATEGORIES = {
+    "tech": ["software", "developer", "programming", "python", "javascript", "react", "coding", "technical", "engineer", "development"],
+    "business": ["management", "business", "analyst", "strategy", "operations", "project", "marketing", "sales"],
+    "creative": ["design", "creative", "marketing", "content", "writing", "visual", "graphic", "ux", "ui"],
+    "data": ["data", "analytics", "analysis", "statistics", "research", "science", "machine learning", "ai"],
+    "leadership": ["lead", "manager", "director", "team", "leadership", "supervisor", "coordinator"]
+}
+
+# Survey preference rules: for each question, the first rule whose answer check passes and whose
+# keywords appear in the career title adds its boost to the alignment score
+PREFERENCE_ALIGNMENT_RULES = {
+    # Work Environment Preference (Question 1)
+    "1": [
+        (lambda answer: answer == "Remote", ["remote", "developer", "writer", "analyst"], 0.15),
+        (lambda answer: answer == "Office", ["manager", "sales", "coordinator"], 0.1),
+        (lambda answer: answer == "Hybrid", ["consultant", "project", "business"], 0.1)
+    ],
+    # Company Size Preference (Question 3)
+    "3": [
+        (lambda answer: "Startup" in answer, ["developer", "designer", "product"], 0.1),
+        (lambda answer: "Large" in answer, ["analyst", "specialist", "coordinator"], 0.1)
+    ],
+    # Career Motivation (Question 6)
+    "6": [
+        (lambda answer: answer == "Creative expression", ["designer", "creative", "content", "marketing"], 0.15),
+        (lambda answer: answer == "Financial growth", ["sales", "business", "manager", "analyst"], 0.1),
+        (lambda answer: answer == "Personal growth", ["consultant", "analyst", "developer"], 0.1)
+    ],
+    # Industry Interest (Question 8)
+    "8": [
+        (lambda answer: answer == "Technology", ["developer", "engineer", "analyst", "data"], 0.15),
+        (lambda answer: answer == "Healthcare", ["analyst", "coordinator", "researcher"], 0.1),
+        (lambda answer: answer == "Marketing", ["marketing", "content", "social", "creative"], 0.15)
+    ],
+    # Work Style Preference (Question 5)
+    "5": [
+        (lambda answer: answer == "Independently", ["developer", "analyst", "writer", "researcher"], 0.1),
+        (lambda answer: answer == "In teams", ["manager", "coordinator", "consultant"], 0.1)
+    ]
+}
+
+# Career title keywords behind the preference explanations
+PREFERENCE_EXPLANATION_KEYWORDS = {
+    "remote": ["remote", "developer", "analyst"],
+    "creative": ["designer", "creative", "marketing"],
+    "technology": ["developer", "engineer", "data"]
+}
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton that finds every known keyword in a text in one linear pass"""
+
+    def __init__(self, keywords):
+        self._automaton = ahocorasick.Automaton()
+        for keyword in set(keywords):
+            self._automaton.add_word(keyword, keyword)
+        self._automaton.make_automaton()
+
+    def find_all(self, text: str) -> FrozenSet[str]:
+        """Every keyword occurring anywhere in text, including overlapping ones ("lead" in "leadership")"""
+        return frozenset(keyword for _, keyword in self._automaton.iter(text))
+
+    def count_all(self, text: str) -> Counter:
+        """How many times each keyword occurs in text, overlapping occurrences included"""
+        return Counter(keyword for _, keyword in self._automaton.iter(text))
+
+# Built once at import from every keyword table used by the offline scorers
+KEYWORD_AUTOMATON = KeywordAutomaton(
+    [keyword for keywords in FALLBACK_KEYWORD_CATEGORIES.values() for keyword in keywords]
+    + [keyword for rules in PREFERENCE_ALIGNMENT_RULES.values() for _, keywords, _ in rules for keyword in keywords]
+    + [keyword for keywords in PREFERENCE_EXPLANATION_KEYWORDS.values() for keyword in keywords]
+)
+
+# Column layout of the batch fallback scorer: one column per distinct fallback keyword, and a
+# (keywords, categories) 0/1 matrix that sums keyword hits into FALLBACK_KEYWORD_CATEGORIES order
+FALLBACK_KEYWORDS = sorted({keyword for keywords in FALLBACK_KEYWORD_CATEGORIES.values() for keyword in keywords})
+FALLBACK_KEYWORD_COLUMNS = {keyword: column for column, keyword in enumerate(FALLBACK_KEYWORDS)}
+FALLBACK_CATEGORY_MEMBERSHIP = sparse.csr_matrix(np.array(
+    [[keyword in keywords for keywords in FALLBACK_KEYWORD_CATEGORIES.values()] for keyword in FALLBACK_KEYWORDS],
+    dtype=np.int64
+))
+# A keyword containing whitespace can span tokens, so those few are checked against the whole text
+FALLBACK_PHRASE_COLUMNS = [
+    (keyword, column) for keyword, column in FALLBACK_KEYWORD_COLUMNS.items() if any(ch.isspace() for ch in keyword)
+]
+
+YEARS_MARKER = re.compile(r'y(?:ear|r)')
+
+def find_years_of_experience(resume_lower: str) -> Optional[int]:
+    """First number directly followed by "year(s)"/"yr(s)", i.e. re.search(r'(\d+)\s*(?:years?|yrs?)').
+
+    Anchoring on the literal marker and walking back is much cheaper than letting the regex
+    try a digit match at every position of a long resume.
+    """
+    for marker in YEARS_MARKER.finditer(resume_lower):
+        digits_end = marker.start()
+        while digits_end > 0 and resume_lower[digits_end - 1].isspace():
+            digits_end -= 1
+        digits_start = digits_end
+        while digits_start > 0 and resume_lower[digits_start - 1].isdecimal():
+            digits_start -= 1
+        if digits_start < digits_end:
+            return int(resume_lower[digits_start:digits_end])
+    return None
+
+def detect_experience_level(resume_lower: str) -> str:
+    years = find_years_of_experience(resume_lower)
+    if years is not None:
         if years < 2:
-            experience_level = "Entry Level"
+            return "Entry Level"
         elif years < 5:
-            experience_level = "Mid Level"
+            return "Mid Level"
         else:
-            experience_level = "Senior Level"
-    else:
-        experience_level = "Mid Level"
+            return "Senior Level"
+    return "Mid Level"
+
+# Offline career matcher: curated skill profiles for every career in CAREER_PATHS
+CAREER_SKILL_PROFILES = {
+    "Software Engineer": ["Software Development", "Programming", "Python", "Java", "JavaScript", "TypeScript", "C++",
+                          "Algorithms", "Data Structures", "APIs", "Git", "Unit Testing", "Debugging", "Cloud",
+                          "Microservices", "Code Review"],
+    "Data Scientist": ["Machine Learning", "Statistics", "Python", "SQL", "Data Analysis", "Statistical Modeling",
+                       "Pandas", "Deep Learning", "Experimentation", "A/B Testing", "Data Visualization",
+                       "Predictive Analytics", "Feature Engineering"],
+    "Product Manager": ["Product Management", "Product Strategy", "Roadmap", "User Stories", "Stakeholder Management",
+                        "Prioritization", "Agile", "Market Research", "Product Launch", "Requirements",
+                        "Customer Discovery", "Metrics"],
+    "UX/UI Designer": ["User Experience", "User Interface", "UX", "UI", "Wireframes", "Prototyping", "Figma",
+                       "Sketch", "User Research", "Usability Testing", "Interaction Design", "Visual Design",
+                       "Design Systems", "Accessibility"],
+    "Digital Marketing Manager": ["Digital Marketing", "SEO", "SEM", "Social Media", "Campaigns", "Google Analytics",
+                                  "Content Marketing", "Email Marketing", "Paid Advertising", "Conversion",
+                                  "Branding", "Marketing Strategy"],
+    "Business Analyst": ["Business Analysis", "Requirements Gathering", "Process Improvement", "SQL", "Excel",
+                         "Stakeholder Management", "Documentation", "Process Mapping", "Reporting",
+                         "Business Intelligence", "Gap Analysis", "User Acceptance Testing"],
+    "Project Manager": ["Project Management", "Project Planning", "Scheduling", "Budgeting", "Risk Management",
+                        "Stakeholder Management", "Agile", "Scrum", "PMP", "Resource Planning", "Delivery",
+                        "Cross Functional"],
+    "Sales Manager": ["Sales", "Business Development", "Account Management", "Negotiation", "CRM", "Salesforce",
+                      "Pipeline", "Quota", "Lead Generation", "Client Relationships", "Revenue", "Closing"],
+    "Content Writer": ["Writing", "Copywriting", "Content", "Editing", "Proofreading", "Blogging", "Storytelling",
+                       "SEO", "Content Strategy", "Research", "Journalism", "Social Media"],
+    "Graphic Designer": ["Graphic Design", "Adobe", "Photoshop", "Illustrator", "InDesign", "Typography",
+                         "Branding", "Layout", "Visual Design", "Illustration", "Print", "Creative"],
+    "Financial Analyst": ["Financial Analysis", "Financial Modeling", "Forecasting", "Budgeting", "Excel",
+                          "Valuation", "Accounting", "Variance Analysis", "Reporting", "Investment", "Finance",
+                          "GAAP"],
+    "HR Manager": ["Human Resources", "HR", "Recruiting", "Talent Acquisition", "Onboarding", "Employee Relations",
+                   "Performance Management", "Compensation", "Benefits", "Training", "HR Policy", "HRIS"],
+    "Operations Manager": ["Operations", "Process Improvement", "Supply Chain", "Logistics", "Lean", "Six Sigma",
+                           "Inventory", "Vendor Management", "KPIs", "Efficiency", "Budgeting", "Team Management"],
+    "Customer Success Manager": ["Customer Success", "Customer Service", "Account Management", "Onboarding",
+                                 "Retention", "Churn", "Customer Relationships", "Support", "Upselling",
+                                 "Customer Satisfaction", "Renewals", "CRM"],
+    "Cybersecurity Analyst": ["Cybersecurity", "Security", "Network Security", "SIEM", "Incident Response",
+                              "Vulnerability Assessment", "Penetration Testing", "Firewalls", "Threat Analysis",
+                              "Compliance", "Encryption", "Risk Assessment"],
+    "Machine Learning Engineer": ["Machine Learning", "Deep Learning", "Python", "TensorFlow", "PyTorch",
+                                  "Model Deployment", "MLOps", "Feature Engineering", "NLP", "Computer Vision",
+                                  "Scikit-learn", "Data Pipelines"],
+    "DevOps Engineer": ["DevOps", "CI/CD", "Docker", "Kubernetes", "Terraform", "AWS", "Azure", "Jenkins",
+                        "Infrastructure as Code", "Linux", "Monitoring", "Automation"],
+    "Marketing Coordinator": ["Marketing", "Campaigns", "Social Media", "Content", "Email Marketing", "Events",
+                              "Market Research", "Coordination", "Branding", "Marketing Materials", "Scheduling",
+                              "Reporting"],
+    "Consultant": ["Consulting", "Client Engagement", "Strategy", "Problem Solving", "Business Analysis",
+                   "Presentations", "Stakeholder Management", "Recommendations", "Process Improvement",
+                   "Change Management", "Research", "Workshops"],
+    "Account Manager": ["Account Management", "Client Relationships", "Customer Service", "Upselling", "Renewals",
+                        "Negotiation", "CRM", "Sales", "Retention", "Contracts", "Client Satisfaction",
+                        "Business Development"],
+    "Quality Assurance Engineer": ["Quality Assurance", "QA", "Test Automation", "Selenium", "Test Cases",
+                                   "Regression Testing", "Manual Testing", "Bug Tracking", "Jira", "Test Plans",
+                                   "Cypress", "Unit Testing"],
+    "Systems Administrator": ["Systems Administration", "Linux", "Windows Server", "Active Directory", "Scripting",
+                              "PowerShell", "Bash", "Backups", "Virtualization", "VMware", "Patching",
+                              "Troubleshooting"],
+    "Network Engineer": ["Networking", "Network Engineering", "Cisco", "Routing", "Switching", "TCP/IP", "VPN",
+                         "Firewalls", "LAN", "WAN", "CCNA", "Network Security"],
+    "Database Administrator": ["Database Administration", "SQL", "PostgreSQL", "MySQL", "Oracle", "SQL Server",
+                               "MongoDB", "Performance Tuning", "Backups", "Replication", "Indexing",
+                               "Data Modeling"],
+    "Mobile App Developer": ["Mobile Development", "iOS", "Android", "Swift", "Kotlin", "React Native", "Flutter",
+                             "Mobile Apps", "App Store", "Xcode", "Mobile UI", "APIs"],
+    "Web Developer": ["Web Development", "HTML", "CSS", "JavaScript", "React", "Node.js", "Front End",
+                      "Responsive Design", "WordPress", "PHP", "REST APIs", "Web Performance"],
+    "Technical Writer": ["Technical Writing", "Documentation", "API Documentation", "User Guides", "Editing",
+                         "Markdown", "Style Guides", "Release Notes", "Knowledge Base", "Information Architecture",
+                         "Confluence", "DITA"],
+    "Social Media Manager": ["Social Media", "Social Media Marketing", "Instagram", "TikTok", "LinkedIn",
+                             "Community Management", "Content Calendar", "Influencer Marketing", "Engagement",
+                             "Hootsuite", "Copywriting", "Analytics"],
+    "Event Coordinator": ["Event Planning", "Event Management", "Logistics", "Vendor Management", "Budgeting",
+                          "Scheduling", "Venue", "Conferences", "Hospitality", "Coordination", "Registration",
+                          "On Site Management"],
+    "Training Specialist": ["Training", "Instructional Design", "Curriculum Development", "Facilitation",
+                            "E-Learning", "LMS", "Onboarding", "Coaching", "Workshops", "Training Needs Analysis",
+                            "Presentations", "Learning and Development"],
+}
+
+SKILL_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#/]*")
+
+def normalize_skill(skill: str) -> str:
+    return " ".join(SKILL_TOKEN_PATTERN.findall(skill.lower()))
+
+class CareerSkillMatcher:
+    """TF-IDF cosine similarity between resumes and career skill profiles, with no model or network calls.
+
+    Each distinct skill phrase is one feature. Careers are rows of an L2-normalized sparse matrix over those
+    features and resumes are projected into the same space by counting the phrases they contain, so scoring
+    any number of resumes against every career is one sparse matrix multiply.
+    """
+
+    def __init__(self, profiles: Dict[str, List[str]]):
+        self.careers = list(profiles)
+        career_phrases = [{normalize_skill(skill) for skill in skills} for skills in profiles.values()]
+        self.vocabulary = {phrase: column for column, phrase in enumerate(sorted(set().union(*career_phrases)))}
+        self.profile_phrases = {
+            career: [(skill, normalize_skill(skill)) for skill in skills] for career, skills in profiles.items()
+        }
+        # Phrases padded with spaces and matched against the space-joined tokens, so they only match whole words
+        self.phrase_automaton = KeywordAutomaton(f" {phrase} " for phrase in self.vocabulary)
+
+        document_frequency = np.zeros(len(self.vocabulary))
+        for phrases in career_phrases:
+            document_frequency[[self.vocabulary[phrase] for phrase in phrases]] += 1
+        self.idf = np.log((1 + len(self.careers)) / (1 + document_frequency)) + 1
+        career_matrix = self.vectorize([" , ".join(skills) for skills in profiles.values()])
+        # Dense (vocabulary, careers) transpose: a sparse-times-dense product skips building a sparse result
+        self.career_columns = career_matrix.T.toarray()
+
+    def phrase_counts(self, text: str) -> Dict[str, int]:
+        """How often each skill phrase occurs in the text, matched on word boundaries"""
+        tokens = SKILL_TOKEN_PATTERN.findall(text.lower())
+        counts = self.phrase_automaton.count_all(f" {' '.join(tokens)} ")
+        return {padded[1:-1]: count for padded, count in counts.items()}
+
+    def vectorize(self, texts: List[str], phrase_counts: Optional[List[Dict[str, int]]] = None) -> sparse.csr_matrix:
+        """Sublinear TF-IDF rows, L2-normalized, one per text; phrase_counts skips recounting texts already counted"""
+        if phrase_counts is None:
+            phrase_counts = [self.phrase_counts(text) for text in texts]
+        indptr = [0]
+        columns, counts = [], []
+        for text_counts in phrase_counts:
+            for phrase, count in text_counts.items():
+                columns.append(self.vocabulary[phrase])
+                counts.append(count)
+            indptr.append(len(columns))
+
+        # Weights and row norms are computed on the flat arrays; the CSR matrix is assembled once at the end
+        columns = np.asarray(columns, dtype=np.int32)
+        indptr = np.asarray(indptr, dtype=np.int32)
+        weights = (1 + np.log(np.asarray(counts, dtype=np.float64))) * self.idf[columns]
+        row_lengths = np.diff(indptr)
+        norms = np.sqrt(np.bincount(np.repeat(np.arange(len(texts)), row_lengths), weights ** 2, minlength=len(texts)))
+        norms[norms == 0] = 1
+        weights /= np.repeat(norms, row_lengths)
+        return sparse.csr_matrix((weights, columns, indptr), shape=(len(texts), len(self.vocabulary)))
+
+    def similarities(self, resume_texts: List[str],
+                     phrase_counts: Optional[List[Dict[str, int]]] = None) -> np.ndarray:
+        """(N, len(careers)) cosine similarity of each resume to each career, from one matrix multiply"""
+        return self.vectorize(resume_texts, phrase_counts) @ self.career_columns
+
+    def rank(self, resume_text: str, similarities: Optional[np.ndarray] = None) -> List[Tuple[str, float]]:
+        """Every career with a non-zero similarity, best first"""
+        if similarities is None:
+            similarities = self.similarities([resume_text])[0]
+        order = np.argsort(-similarities, kind="stable")
+        return [(self.careers[i], float(similarities[i])) for i in order if similarities[i] > 0]
+
+CAREER_SKILL_MATCHER = CareerSkillMatcher(CAREER_SKILL_PROFILES)
+
+def skill_profile_suggestions(resume_text: str, similarities: Optional[np.ndarray] = None,
+                              resume_phrases: Optional[Dict[str, int]] = None):
+    """Fallback suggestions from the offline matcher, best match first, built lazily as the caller consumes them"""
+    if resume_phrases is None:
+        resume_phrases = CAREER_SKILL_MATCHER.phrase_counts(resume_text)
+    if similarities is None:
+        similarities = CAREER_SKILL_MATCHER.similarities([resume_text], [resume_phrases])[0]
+    ranked = CAREER_SKILL_MATCHER.rank(resume_text, similarities)
+    if not ranked:
+        return
+    for career, similarity in ranked:
+        skills = CAREER_SKILL_MATCHER.profile_phrases[career]
+        matched = [skill for skill, phrase in skills if phrase in resume_phrases]
+        yield {
+            "career_path": career,
+            "match_score": round(0.55 + 0.4 * similarity, 4),
+            "reasoning": f"Resume covers {len(matched)} of the {len(skills)} core {career} skills",
+            "key_skills": matched[:3]
+        }
+
+def generate_intelligent_fallback(resume_text: str) -> Dict[str, Any]:
+    """Generate intelligent career suggestions based on resume content analysis"""
+    resume_lower = resume_text.lower()
     
-    # Generate suggestions based on keyword analysis
+    return build_fallback_analysis(
+        *fallback_keyword_scores(resume_lower),
+        detect_experience_level(resume_lower), skill_profile_suggestions(resume_text)
+    )
+
+def fallback_keyword_scores(resume_lower: str) -> Tuple[int, ...]:
+    """How many keywords of each FALLBACK_KEYWORD_CATEGORIES category occur in the lowercased resume"""
+    keyword_hits = KEYWORD_AUTOMATON.find_all(resume_lower)
+    return tuple(
+        sum(1 for keyword in keywords if keyword in keyword_hits)
+        for keywords in FALLBACK_KEYWORD_CATEGORIES.values()
+    )
+
+def score_fallback_keywords_batch(resume_lowers: List[str]) -> np.ndarray:
+    """Score every fallback keyword category for many lowercased resumes at once.
+
+    Returns an (N, 5) integer matrix in FALLBACK_KEYWORD_CATEGORIES order, identical to what
+    fallback_keyword_scores computes one resume at a time. The batch's token vocabulary is matched
+    against the keywords once, the resumes become one sparse (resume, token) term matrix, and two
+    sparse products turn that into keyword presence and then category counts.
+    """
+    doc_tokens = [set(text.split()) for text in resume_lowers]
+
+    # (token, keyword) hits for every distinct token in the batch that contains a fallback keyword
+    token_rows: Dict[str, int] = {}
+    hit_rows, hit_columns = [], []
+    for token in set().union(*doc_tokens):
+        columns = [FALLBACK_KEYWORD_COLUMNS[keyword] for keyword in KEYWORD_AUTOMATON.find_all(token)
+                   if keyword in FALLBACK_KEYWORD_COLUMNS]
+        if columns:
+            row = token_rows.setdefault(token, len(token_rows))
+            hit_rows.extend([row] * len(columns))
+            hit_columns.extend(columns)
+    token_keywords = sparse.csr_matrix(
+        (np.ones(len(hit_rows), dtype=np.int64), (hit_rows, hit_columns)),
+        shape=(len(token_rows), len(FALLBACK_KEYWORDS))
+    )
+
+    # Term matrix over the matching tokens only; every other token contributes nothing
+    indptr = [0]
+    indices = []
+    for tokens in doc_tokens:
+        indices.extend(map(token_rows.__getitem__, tokens & token_rows.keys()))
+        indptr.append(len(indices))
+    term_matrix = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int64), indices, indptr), shape=(len(resume_lowers), len(token_rows))
+    )
+
+    phrase_hits = [(row, column) for row, text in enumerate(resume_lowers)
+                   for keyword, column in FALLBACK_PHRASE_COLUMNS if keyword in text]
+    phrase_matrix = sparse.csr_matrix(
+        (np.ones(len(phrase_hits), dtype=np.int64), ([row for row, _ in phrase_hits], [column for _, column in phrase_hits])),
+        shape=(len(resume_lowers), len(FALLBACK_KEYWORDS))
+    )
+
+    keyword_presence = ((term_matrix @ token_keywords + phrase_matrix) > 0).astype(np.int64)
+    return (keyword_presence @ FALLBACK_CATEGORY_MEMBERSHIP).toarray()
+
+def fallback_rule_suggestions(tech_score: int, business_score: int, creative_score: int, data_score: int,
+                              leadership_score: int, experience_level: str) -> List[Dict[str, Any]]:
+    """Suggestions the keyword category rules produce on their own, before any slots are filled"""
     suggestions = []
     
     # Tech-focused suggestions
@@ -275,6 +1675,18 @@ def generate_intelligent_fallback(resume_text: str) -> Dict[str, Any]:
             "key_skills": ["Leadership", "Project Management", "Communication"]
         })
     
+    return suggestions
+
+def build_fallback_analysis(tech_score: int, business_score: int, creative_score: int, data_score: int,
+                            leadership_score: int, experience_level: str,
+                            profile_suggestions=None, rule_suggestions=None) -> Dict[str, Any]:
+    """Turn keyword category scores into the fallback analysis payload; rule_suggestions reuses rules already run"""
+    if rule_suggestions is None:
+        rule_suggestions = fallback_rule_suggestions(
+            tech_score, business_score, creative_score, data_score, leadership_score, experience_level
+        )
+    suggestions = rule_suggestions
+    
     # Ensure we have at least 3 suggestions
     default_suggestions = [
         {
@@ -297,9 +1709,23 @@ def generate_intelligent_fallback(resume_text: str) -> Dict[str, Any]:
         }
     ]
     
+    # Fill remaining slots with the closest skill-profile matches, then the generic defaults.
+    # The profile suggestions are lazy, so the matcher only runs when a slot is actually open.
+    suggested_paths = {suggestion["career_path"] for suggestion in suggestions}
+    if len(suggestions) < 3:
+        for suggestion in profile_suggestions or []:
+            if suggestion["career_path"] not in suggested_paths:
+                suggestions.append(suggestion)
+                suggested_paths.add(suggestion["career_path"])
+                if len(suggestions) >= 3:
+                    break
+    
     # Add default suggestions if needed
-    while len(suggestions) < 3:
-        suggestions.append(default_suggestions[len(suggestions)])
+    for suggestion in default_suggestions[len(suggestions):] + default_suggestions[:len(suggestions)]:
+        if len(suggestions) >= 3:
+            break
+        if suggestion["career_path"] not in suggested_paths:
+            suggestions.append(suggestion)
     
     # Sort by match score and take top 3
     suggestions.sort(key=lambda x: x["match_score"], reverse=True)
@@ -322,16 +1748,38 @@ def generate_intelligent_fallback(resume_text: str) -> Dict[str, Any]:
         "experience_level": experience_level
     }
 
+def generate_intelligent_fallback_batch(resume_texts: List[str]) -> List[Dict[str, Any]]:
+    """Batch equivalent of generate_intelligent_fallback for scoring many resumes at once.
+
+    Keyword categories for the whole batch come from one sparse term-matrix pass. Only the resumes the
+    keyword rules leave with an open suggestion slot go through the skill matcher, and those are scored
+    against the career profiles in one matrix multiply.
+    """
+    if not resume_texts:
+        return []
+    resume_lowers = [text.lower() for text in resume_texts]
+    scores = score_fallback_keywords_batch(resume_lowers).tolist()
+    experience_levels = [detect_experience_level(resume_lower) for resume_lower in resume_lowers]
+    rule_suggestions = [fallback_rule_suggestions(*row, level) for row, level in zip(scores, experience_levels)]
+
+    open_rows = [row for row, suggestions in enumerate(rule_suggestions) if len(suggestions) < 3]
+    phrase_counts = [CAREER_SKILL_MATCHER.phrase_counts(resume_texts[row]) for row in open_rows]
+    similarities = CAREER_SKILL_MATCHER.similarities([resume_texts[row] for row in open_rows], phrase_counts)
+    profile_suggestions = {
+        row: skill_profile_suggestions(resume_texts[row], similarity_row, resume_phrases)
+        for row, similarity_row, resume_phrases in zip(open_rows, similarities, phrase_counts)
+    }
+
+    return [
+        build_fallback_analysis(*row_scores, level, profile_suggestions.get(row), rule_suggestions[row])
+        for row, (row_scores, level) in enumerate(zip(scores, experience_levels))
+    ]
+
 # Enhanced AI function that considers survey responses
 async def analyze_resume_with_survey(resume_text: str, survey_responses: Dict[str, Any]) -> Dict[str, Any]:
+    """Survey-aware analysis; analysis_tier in the result says whether the LLM or the rule-based fallback produced it"""
     try:
-        print(f"Starting enhanced AI analysis with survey data...")
-        
-        chat = LlmChat(
-            api_key=ANTHROPIC_API_KEY,
-            session_id=str(uuid.uuid4()),
-            system_message="You are an expert career counselor who provides personalized career recommendations based on both professional background and personal preferences."
-        ).with_model("anthropic", "claude-3-5-sonnet-20241022")
+        system_message = "You are an expert career counselor who provides personalized career recommendations based on both professional background and personal preferences."
 
         # Convert survey responses to readable preferences
         preferences_text = format_survey_preferences(survey_responses)
@@ -383,40 +1831,17 @@ async def analyze_resume_with_survey(resume_text: str, survey_responses: Dict[st
         - Return ONLY valid JSON
         """
 
-        user_message = UserMessage(text=prompt)
-        print("Sending enhanced message to Claude API...")
-        response = await chat.send_message(user_message)
-        print(f"Received enhanced response from Claude: {str(response)[:200]}...")
-        
-        # Parse AI response
-        import json
-        response_text = str(response)
-        print(f"Full enhanced response: {response_text}")
-        
-        start_idx = response_text.find('{')
-        end_idx = response_text.rfind('}') + 1
-        
-        if start_idx != -1 and end_idx != 0:
-            json_str = response_text[start_idx:end_idx]
-            print(f"Extracted enhanced JSON: {json_str}")
-            result = json.loads(json_str)
-            
-            # Ensure preference_match is included in each suggestion
-            for suggestion in result.get("career_suggestions", []):
-                if "preference_match" not in suggestion:
-                    suggestion["preference_match"] = "Good alignment with stated preferences"
-            
-            print(f"Parsed enhanced result: {result}")
-            return result
-        else:
-            print("Could not find JSON in enhanced response")
-            raise ValueError("No JSON found in enhanced response")
-            
+        response = str(await complete_coalesced(system_message, prompt, purpose="survey_analysis"))
+        log_payload("LLM reply", response, purpose="survey_analysis", resume_chars=len(resume_text))
+        # Suggestions without a preference_match get the model's default one
+        result = structured_output_parser.parse(response, SurveyAnalysisPayload, purpose="survey_analysis").model_dump()
+        return {**result, "analysis_tier": "survey_llm"}
     except Exception as e:
-        print(f"Enhanced AI analysis error: {e}")
+        logger.warning("Enhanced AI analysis failed, using the survey fallback", extra={"fields": {"purpose": "survey_analysis", "error": repr(e)}})
         # Return enhanced fallback with actual preference consideration
-        return generate_survey_enhanced_fallback(resume_text, survey_responses)
+        return {**generate_survey_enhanced_fallback(resume_text, survey_responses), "analysis_tier": "survey_local"}
 
+@counts_fallback("survey_analysis")
 def generate_survey_enhanced_fallback(resume_text: str, survey_responses: Dict[str, Any]) -> Dict[str, Any]:
     """Generate career suggestions that combine resume analysis (70-80%) with survey preferences (20-30%)"""
     
@@ -477,76 +1902,72 @@ def generate_survey_enhanced_fallback(resume_text: str, survey_responses: Dict[s
         "experience_level": base_analysis["experience_level"]
     }
 
-def calculate_preference_alignment(career_path: str, survey_responses: Dict[str, Any]) -> float:
-    """Calculate how well a career aligns with survey preferences (0.0 to 1.0)"""
+def compute_preference_contribution(career_hits: FrozenSet[str], question_id: str, answer: Any) -> float:
+    """Boost a single survey answer adds to a career's alignment score"""
+    for matches_answer, keywords, boost in PREFERENCE_ALIGNMENT_RULES[question_id]:
+        if matches_answer(answer) and not career_hits.isdisjoint(keywords):
+            return boost
+    return 0.0
+
+def compute_preference_alignment(career_path: str, survey_responses: Dict[str, Any]) -> float:
+    """Rule-by-rule alignment score, used for careers and answers outside the precomputed table"""
     alignment_score = 0.5  # Neutral starting point
-    total_factors = 0
-    
-    career_lower = career_path.lower()
-    
-    # Work Environment Preference (Question 1)
-    if "1" in survey_responses:
-        work_env = survey_responses["1"]
-        if work_env == "Remote" and any(word in career_lower for word in ["remote", "developer", "writer", "analyst"]):
-            alignment_score += 0.15
-        elif work_env == "Office" and any(word in career_lower for word in ["manager", "sales", "coordinator"]):
-            alignment_score += 0.1
-        elif work_env == "Hybrid" and any(word in career_lower for word in ["consultant", "project", "business"]):
-            alignment_score += 0.1
-        total_factors += 1
     
-    # Company Size Preference (Question 3)
-    if "3" in survey_responses:
-        company_size = survey_responses["3"]
-        if "Startup" in company_size and any(word in career_lower for word in ["developer", "designer", "product"]):
-            alignment_score += 0.1
-        elif "Large" in company_size and any(word in career_lower for word in ["analyst", "specialist", "coordinator"]):
-            alignment_score += 0.1
-        total_factors += 1
-    
-    # Career Motivation (Question 6)
-    if "6" in survey_responses:
-        motivation = survey_responses["6"]
-        if motivation == "Creative expression" and any(word in career_lower for word in ["designer", "creative", "content", "marketing"]):
-            alignment_score += 0.15
-        elif motivation == "Financial growth" and any(word in career_lower for word in ["sales", "business", "manager", "analyst"]):
-            alignment_score += 0.1
-        elif motivation == "Personal growth" and any(word in career_lower for word in ["consultant", "analyst", "developer"]):
-            alignment_score += 0.1
-        total_factors += 1
-    
-    # Industry Interest (Question 8)
-    if "8" in survey_responses:
-        industry = survey_responses["8"]
-        if industry == "Technology" and any(word in career_lower for word in ["developer", "engineer", "analyst", "data"]):
-            alignment_score += 0.15
-        elif industry == "Healthcare" and any(word in career_lower for word in ["analyst", "coordinator", "researcher"]):
-            alignment_score += 0.1
-        elif industry == "Marketing" and any(word in career_lower for word in ["marketing", "content", "social", "creative"]):
-            alignment_score += 0.15
-        total_factors += 1
+    career_hits = KEYWORD_AUTOMATON.find_all(career_path.lower())
     
-    # Work Style Preference (Question 5)
-    if "5" in survey_responses:
-        work_style = survey_responses["5"]
-        if work_style == "Independently" and any(word in career_lower for word in ["developer", "analyst", "writer", "researcher"]):
-            alignment_score += 0.1
-        elif work_style == "In teams" and any(word in career_lower for word in ["manager", "coordinator", "consultant"]):
-            alignment_score += 0.1
-        total_factors += 1
+    for question_id in PREFERENCE_ALIGNMENT_RULES:
+        if question_id in survey_responses:
+            alignment_score += compute_preference_contribution(career_hits, question_id, survey_responses[question_id])
     
     # Ensure score stays within bounds
     return min(1.0, max(0.0, alignment_score))
 
+class PreferenceAlignmentTable:
+    """Contribution of every (career, question, answer) triple, precomputed over the closed survey options"""
+
+    def __init__(self, careers: List[str], survey_questions: List[Dict[str, Any]]):
+        options = {str(question["id"]): question.get("options", []) for question in survey_questions}
+        self._rows: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for career in careers:
+            career_hits = KEYWORD_AUTOMATON.find_all(career.lower())
+            self._rows[career] = {
+                question_id: {
+                    answer: compute_preference_contribution(career_hits, question_id, answer)
+                    for answer in options[question_id]
+                }
+                for question_id in PREFERENCE_ALIGNMENT_RULES
+            }
+
+    def score(self, career_path: str, survey_responses: Dict[str, Any]) -> float:
+        row = self._rows.get(career_path)
+        if row is None:
+            return compute_preference_alignment(career_path, survey_responses)
+        
+        # Summed in rule order so the result is bit-for-bit identical to compute_preference_alignment
+        alignment_score = 0.5
+        for question_id, contributions in row.items():
+            if question_id not in survey_responses:
+                continue
+            answer = survey_responses[question_id]
+            contribution = contributions.get(answer) if isinstance(answer, str) else None
+            if contribution is None:
+                return compute_preference_alignment(career_path, survey_responses)
+            alignment_score += contribution
+        return min(1.0, max(0.0, alignment_score))
+
+def calculate_preference_alignment(career_path: str, survey_responses: Dict[str, Any]) -> float:
+    """Calculate how well a career aligns with survey preferences (0.0 to 1.0)"""
+    return PREFERENCE_ALIGNMENT_TABLE.score(career_path, survey_responses)
+
 def generate_preference_explanation(career_path: str, survey_responses: Dict[str, Any], preference_score: float) -> Dict[str, str]:
     """Generate explanations for how the career aligns with preferences"""
     
     explanations = []
-    career_lower = career_path.lower()
+    career_hits = KEYWORD_AUTOMATON.find_all(career_path.lower())
     
     # Check specific preference alignments
     if "1" in survey_responses and survey_responses["1"] == "Remote":
-        if any(word in career_lower for word in ["remote", "developer", "analyst"]):
+        if not career_hits.isdisjoint(PREFERENCE_EXPLANATION_KEYWORDS["remote"]):
             explanations.append("supports remote work flexibility")
     
     if "3" in survey_responses:
@@ -558,14 +1979,14 @@ def generate_preference_explanation(career_path: str, survey_responses: Dict[str
     
     if "6" in survey_responses:
         motivation = survey_responses["6"]
-        if motivation == "Creative expression" and any(word in career_lower for word in ["designer", "creative", "marketing"]):
+        if motivation == "Creative expression" and not career_hits.isdisjoint(PREFERENCE_EXPLANATION_KEYWORDS["creative"]):
             explanations.append("offers creative fulfillment and self-expression")
         elif motivation == "Financial growth":
             explanations.append("provides strong earning potential and career advancement")
     
     if "8" in survey_responses:
         industry = survey_responses["8"]
-        if industry == "Technology" and any(word in career_lower for word in ["developer", "engineer", "data"]):
+        if industry == "Technology" and not career_hits.isdisjoint(PREFERENCE_EXPLANATION_KEYWORDS["technology"]):
             explanations.append("aligns with your technology industry interest")
     
     # Generate final explanation
@@ -605,6 +2026,16 @@ def get_preference_aligned_careers(survey_responses: Dict[str, Any]) -> List[str
     
     return list(set(aligned_careers))  # Remove duplicates
 
+# Titles the offline scorers can suggest on top of CAREER_PATHS
+OFFLINE_CAREER_TITLES = [
+    "Junior Software Developer", "Data Analyst", "Senior Data Scientist", "UX Designer",
+    "Business Development Representative", "Operations Coordinator", "Remote Software Developer",
+    "Digital Marketing Specialist", "Content Creator", "Marketing Creative", "Startup Product Manager",
+    "Growth Marketing Manager"
+]
+
+PREFERENCE_ALIGNMENT_TABLE = PreferenceAlignmentTable(CAREER_PATHS + OFFLINE_CAREER_TITLES, SURVEY_QUESTIONS)
+
 def get_career_skills(career_path: str) -> List[str]:
     """Get relevant skills for a career path"""
     career_skills = {
@@ -657,13 +2088,31 @@ def format_survey_preferences(survey_responses: Dict[str, Any]) -> str:
     return "\n".join(preferences)
 
 # Calculate career score using AI
+CAREER_SCORE_UNPARSED_FALLBACK = {
+    "current_score": 70,
+    "skill_gaps": ["Industry Knowledge", "Advanced Skills", "Leadership Experience"],
+    "strength_areas": ["Communication", "Basic Skills"],
+    "recommendations": [
+        "Take relevant online courses",
+        "Gain hands-on experience through projects",
+        "Network with industry professionals"
+    ]
+}
+
+CAREER_SCORE_ERROR_FALLBACK = {
+    "current_score": 65,
+    "skill_gaps": ["Technical Skills", "Industry Experience"],
+    "strength_areas": ["Communication", "Problem Solving"],
+    "recommendations": [
+        "Complete online courses",
+        "Build a portfolio",
+        "Join professional communities"
+    ]
+}
+
 async def calculate_career_score_with_ai(resume_text: str, career_path: str) -> Dict[str, Any]:
     try:
-        chat = LlmChat(
-            api_key=ANTHROPIC_API_KEY,
-            session_id=str(uuid.uuid4()),
-            system_message="You are a career assessment expert. Evaluate how well a candidate's resume matches a specific career path."
-        ).with_model("anthropic", "claude-3-5-sonnet-20241022")
+        system_message = "You are a career assessment expert. Evaluate how well a candidate's resume matches a specific career path."
 
         prompt = f"""
         Evaluate this resume for the career path: {career_path}
@@ -686,44 +2135,830 @@ async def calculate_career_score_with_ai(resume_text: str, career_path: str) ->
         Score should be 0-100 based on how well the resume matches the ideal candidate for {career_path}.
         """
 
-        user_message = UserMessage(text=prompt)
-        response = await chat.send_message(user_message)
-        
-        # Parse AI response
-        import json
-        try:
-            response_text = str(response)
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
-            if start_idx != -1 and end_idx != 0:
-                json_str = response_text[start_idx:end_idx]
-                return json.loads(json_str)
-        except:
-            pass
-        
-        # Fallback
-        return {
-            "current_score": 70,
-            "skill_gaps": ["Industry Knowledge", "Advanced Skills", "Leadership Experience"],
-            "strength_areas": ["Communication", "Basic Skills"],
-            "recommendations": [
-                "Take relevant online courses",
-                "Gain hands-on experience through projects",
-                "Network with industry professionals"
+        response = await complete_coalesced(system_message, prompt, purpose="career_score")
+    except Exception as e:
+        logger.warning("Career score failed, using the error fallback", extra={"fields": {"purpose": "career_score", "error": repr(e)}})
+        FALLBACK_TOTAL.labels(path="career_score_error").inc()
+        return copy.deepcopy(CAREER_SCORE_ERROR_FALLBACK)
+
+    try:
+        return structured_output_parser.parse(str(response), CareerScorePayload, purpose="career_score").model_dump()
+    except LlmOutputError:
+        FALLBACK_TOTAL.labels(path="career_score_unparsed").inc()
+        return copy.deepcopy(CAREER_SCORE_UNPARSED_FALLBACK)
+
+async def score_career_path_batch(resume_text: str, career_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Score several career paths with a single prompt; paths missing from the reply get the fallback score"""
+    try:
+        system_message = "You are a career assessment expert. Evaluate how well a candidate's resume matches each of several career paths."
+
+        path_list = "\n".join(f"- {career_path}" for career_path in career_paths)
+        prompt = f"""
+        Evaluate this resume for each of the following career paths:
+        {path_list}
+
+        Resume:
+        {resume_text}
+
+        Provide a detailed assessment of every career path in JSON format:
+        {{
+            "scores": [
+                {{
+                    "career_path": "Career path exactly as listed above",
+                    "current_score": 75,
+                    "skill_gaps": ["gap1", "gap2", "gap3"],
+                    "strength_areas": ["strength1", "strength2"],
+                    "recommendations": [
+                        "Take online course in X",
+                        "Gain experience in Y through volunteering",
+                        "Network with professionals in Z field"
+                    ]
+                }}
             ]
-        }
+        }}
+
+        Include exactly one entry per career path listed. Each score should be 0-100 based on how well the resume matches the ideal candidate for that career path. Return ONLY valid JSON.
+        """
+
+        response = await complete_coalesced(system_message, prompt, purpose="career_score_batch")
     except Exception as e:
+        logger.warning("Career score batch failed, using the error fallback", extra={"fields": {
+            "purpose": "career_score_batch", "career_paths": len(career_paths), "error": repr(e)
+        }})
+        FALLBACK_TOTAL.labels(path="career_score_error").inc(len(career_paths))
+        return {career_path: copy.deepcopy(CAREER_SCORE_ERROR_FALLBACK) for career_path in career_paths}
+
+    scored = {}
+    try:
+        payload = structured_output_parser.parse(str(response), CareerScoreBatchPayload, purpose="career_score_batch")
+        for entry in payload.scores:
+            scored[entry.career_path.strip().lower()] = entry.model_dump(exclude={"career_path"})
+    except LlmOutputError:
+        pass
+
+    results = {}
+    for career_path in career_paths:
+        entry = scored.get(career_path.strip().lower())
+        if entry is None:
+            FALLBACK_TOTAL.labels(path="career_score_unparsed").inc()
+            entry = copy.deepcopy(CAREER_SCORE_UNPARSED_FALLBACK)
+        results[career_path] = entry
+    return results
+
+async def calculate_career_scores_with_ai(resume_text: str, career_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Score many career paths, fanning out one prompt per chunk when the list is too long for a single prompt"""
+    chunks = [
+        career_paths[start:start + CAREER_SCORE_PATHS_PER_PROMPT]
+        for start in range(0, len(career_paths), CAREER_SCORE_PATHS_PER_PROMPT)
+    ]
+    # Concurrency is bounded by the gateway semaphore
+    chunk_results = await asyncio.gather(*[score_career_path_batch(resume_text, chunk) for chunk in chunks])
+    return {career_path: result for chunk_result in chunk_results for career_path, result in chunk_result.items()}
+
+# Resume analysis job queue
+# Tiered resume analysis: the offline analyzer answers the upload, the LLM upgrades the stored result later
+async def create_local_analysis(user_id: str, resume_text: str, resume_text_hash: str) -> ResumeAnalysisResponse:
+    """Analyze a resume with the offline analyzer and save it as the user's latest analysis"""
+    analysis_result = generate_intelligent_fallback(resume_text)
+    analysis = ResumeAnalysisResponse(
+        user_id=user_id,
+        career_suggestions=[CareerSuggestion(**suggestion) for suggestion in analysis_result["career_suggestions"]],
+        extracted_skills=analysis_result["extracted_skills"],
+        experience_level=analysis_result["experience_level"],
+        resume_text_hash=resume_text_hash,
+        analysis_tier="local"
+    )
+    await db.resume_analyses.insert_one(analysis.dict())
+    return analysis
+
+async def refine_resume_analysis(analysis_id: str, resume_text_hash: str, timeout_seconds: float) -> bool:
+    """Replace a local analysis with the LLM's; False when the document was already refined or is gone"""
+    resume_text = await resume_text_store.get(resume_text_hash)
+    if resume_text is None:
+        raise ValueError(f"Resume text {resume_text_hash} not found")
+
+    analysis_result = await asyncio.wait_for(analyze_resume_with_llm(resume_text), timeout=timeout_seconds)
+    return await apply_llm_analysis(analysis_id, analysis_result)
+
+async def apply_llm_analysis(analysis_id: str, analysis_result: Dict[str, Any]) -> bool:
+    """Upgrade a stored local analysis to the LLM result, unless something already did"""
+    career_suggestions = [CareerSuggestion(**suggestion).dict() for suggestion in analysis_result["career_suggestions"]]
+
+    update = await db.resume_analyses.update_one(
+        {"id": analysis_id, "analysis_tier": "local"},
+        {"$set": {
+            "career_suggestions": career_suggestions,
+            "extracted_skills": analysis_result["extracted_skills"],
+            "experience_level": analysis_result["experience_level"],
+            "analysis_tier": "llm"
+        }}
+    )
+    return update.modified_count == 1
+
+# Streaming resume analysis
+class SuggestionStreamParser:
+    """Incremental scanner over a streamed JSON reply that returns each career_suggestions item once it is complete.
+
+    Tracks string/escape state and nesting depth character by character, so an item is parsed as soon as its
+    closing brace arrives, without re-parsing the reply so far. Text before the first "{" is ignored.
+    """
+
+    def __init__(self, array_key: str = "career_suggestions"):
+        self.array_key = array_key
+        self._parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key_chars: Optional[List[str]] = None
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._in_array = False
+        self._item_chars: Optional[List[str]] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self._parts.append(chunk)
+        items = []
+        for char in chunk:
+            if self._item_chars is not None:
+                self._item_chars.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_chars is not None:
+                        self._last_string = "".join(self._key_chars)
+                        self._key_chars = None
+                elif self._key_chars is not None:
+                    self._key_chars.append(char)
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                # Only top-level strings can be the key that opens the suggestions array
+                self._key_chars = [] if self._depth == 1 else None
+            elif char == ":" and self._depth == 1:
+                self._current_key = self._last_string
+            elif char == "," and self._depth == 1:
+                self._current_key = None
+            elif char in "{[":
+                self._depth += 1
+                if char == "[" and self._depth == 2 and self._current_key == self.array_key:
+                    self._in_array = True
+                elif char == "{" and self._depth == 3 and self._in_array:
+                    self._item_chars = ["{"]
+            elif char in "}]":
+                if char == "}" and self._depth == 3 and self._item_chars is not None:
+                    try:
+                        items.append(orjson.loads("".join(self._item_chars)))
+                    except orjson.JSONDecodeError:
+                        pass
+                    self._item_chars = None
+                elif char == "]" and self._depth == 2:
+                    self._in_array = False
+                self._depth -= 1
+        return items
+
+async def stream_resume_analysis(resume_text: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ("suggestion", item) for each career suggestion as the LLM produces it, then ("result", analysis)"""
+    cache_key = resume_analysis_cache_key(resume_text)
+    result = await resume_analysis_cache.get(cache_key)
+    if result is None:
+        parser = SuggestionStreamParser()
+        async for chunk in llm_gateway.stream(RESUME_ANALYSIS_SYSTEM_MESSAGE, build_resume_analysis_prompt(resume_text), purpose="resume_analysis_stream"):
+            for suggestion in parser.feed(chunk):
+                yield "suggestion", CareerSuggestion(**suggestion).dict()
+        result = structured_output_parser.parse(parser.text, ResumeAnalysisPayload, purpose="resume_analysis_stream").model_dump()
+        await resume_analysis_cache.set(cache_key, result)
+    else:
+        for suggestion in result["career_suggestions"]:
+            yield "suggestion", CareerSuggestion(**suggestion).dict()
+    yield "result", result
+
+class AnalysisJobQueue:
+    """MongoDB-backed job queue with a pool of async workers.
+
+    Claiming a job hides it for the visibility timeout; if the worker dies before finishing,
+    the job becomes visible again and another worker retries it, up to max_attempts.
+    """
+
+    def __init__(self, collection, worker_count: int, visibility_timeout_seconds: float,
+                 retry_backoff_seconds: float, poll_interval_seconds: float):
+        self.collection = collection
+        self.worker_count = worker_count
+        self.visibility_timeout_seconds = visibility_timeout_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def enqueue(self, user_id: str, resume_text_hash: str, analysis_id: str, deadline_at: datetime,
+                      visible_at: Optional[datetime] = None) -> AnalysisJob:
+        """Queue a refinement; a later visible_at holds it back while something else tries to refine first"""
+        job = AnalysisJob(user_id=user_id, resume_text_hash=resume_text_hash, analysis_id=analysis_id, deadline_at=deadline_at)
+        if visible_at is not None:
+            job.visible_at = visible_at
+        await self.collection.insert_one(job.dict())
+        if visible_at is None and self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def hold(self, job_id: str, visible_at: datetime):
+        """Keep a held-back job hidden until visible_at; a hold that already lapsed or was released is left alone"""
+        now = datetime.utcnow()
+        await self.collection.update_one(
+            {"id": job_id, "status": "queued", "visible_at": {"$gt": now}},
+            {"$set": {"visible_at": visible_at, "updated_at": now}}
+        )
+
+    async def release(self, job_id: str):
+        """Make a held-back job visible to the workers now"""
+        await self.collection.update_one({"id": job_id, "status": "queued"}, {"$set": {"visible_at": datetime.utcnow(), "updated_at": datetime.utcnow()}})
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def complete(self, job_id: str, error: Optional[str] = None):
+        """Finish a job no worker has claimed yet, because its refinement already happened elsewhere"""
+        update = await self.collection.update_one(
+            {"id": job_id, "status": "queued"},
+            {"$set": {"status": "done", "error": error, "updated_at": datetime.utcnow()}}
+        )
+        if update.modified_count == 1 and error:
+            FALLBACK_TOTAL.labels(path="local_analysis_final").inc()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({"id": job_id}, projection={"_id": 0})
+
+    async def claim(self) -> Optional[Dict[str, Any]]:
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {"status": {"$in": ["queued", "running"]}, "visible_at": {"$lte": now}},
+            {
+                "$set": {
+                    "status": "running",
+                    "visible_at": now + timedelta(seconds=self.visibility_timeout_seconds),
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("visible_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _finish(self, job: Dict[str, Any], fields: Dict[str, Any]):
+        # Matching on attempts fences off a worker whose lease already expired and was re-claimed
+        update = await self.collection.update_one(
+            {"id": job["id"], "attempts": job["attempts"]},
+            {"$set": {**fields, "updated_at": datetime.utcnow()}}
+        )
+        if update.modified_count == 1 and fields["status"] == "done" and fields.get("error"):
+            FALLBACK_TOTAL.labels(path="local_analysis_final").inc()
+
+    async def process(self, job: Dict[str, Any]):
+        if not job.get("analysis_id") or not job.get("deadline_at"):
+            await self._finish(job, {"status": "failed", "error": "Job was queued before tiered analysis; upload the resume again"})
+            return
+        # The local analysis is already stored, so running out of attempts or time leaves it as the final result
+        if job["attempts"] > job["max_attempts"]:
+            await self._finish(job, {"status": "done", "error": "Exceeded maximum attempts; local analysis is final"})
+            return
+        remaining_seconds = (job["deadline_at"] - datetime.utcnow()).total_seconds()
+        if remaining_seconds <= 0:
+            await self._finish(job, {"status": "done", "error": "Refinement deadline passed; local analysis is final"})
+            return
+
+        try:
+            await refine_resume_analysis(job["analysis_id"], job["resume_text_hash"], remaining_seconds)
+        except asyncio.TimeoutError:
+            await self._finish(job, {"status": "done", "error": "Refinement deadline passed; local analysis is final"})
+            return
+        except Exception as e:
+            logger.warning("Analysis job attempt failed", extra={"fields": {"job_id": job["id"], "attempts": job["attempts"], "error": repr(e)}})
+            retry_at = datetime.utcnow() + timedelta(seconds=self.retry_backoff_seconds * job["attempts"])
+            if job["attempts"] < job["max_attempts"] and retry_at < job["deadline_at"]:
+                await self._finish(job, {"status": "queued", "visible_at": retry_at, "error": str(e)})
+            else:
+                await self._finish(job, {"status": "done", "error": f"LLM refinement failed; local analysis is final: {e}"})
+            return
+
+        await self._finish(job, {"status": "done", "error": None})
+
+    async def _worker(self):
+        while True:
+            try:
+                job = await self.claim()
+            except Exception as e:
+                logger.warning("Analysis job claim failed", extra={"fields": {"error": repr(e)}})
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            try:
+                await self.process(job)
+            except Exception as e:
+                # The job stays claimed until its visibility timeout, then another worker retries it
+                logger.error("Analysis job processing failed", extra={"fields": {"job_id": job["id"], "attempts": job["attempts"], "error": repr(e)}})
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+analysis_job_queue = AnalysisJobQueue(
+    db.analysis_jobs,
+    ANALYSIS_WORKERS,
+    ANALYSIS_JOB_VISIBILITY_TIMEOUT_SECONDS,
+    ANALYSIS_JOB_RETRY_BACKOFF_SECONDS,
+    ANALYSIS_JOB_POLL_INTERVAL_SECONDS
+)
+
+async def get_analysis_job_status(job_id: str) -> AnalysisJobStatus:
+    job = await analysis_job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+
+    # The analysis exists from the moment of upload; while the job runs it is the local tier
+    analysis = await db.resume_analyses.find_one({"id": job["analysis_id"]}, projection=ANALYSIS_PROJECTION)
+
+    return AnalysisJobStatus(
+        job_id=job["id"],
+        status=job["status"],
+        attempts=job["attempts"],
+        analysis=analysis,
+        error=job.get("error")
+    )
+
+# MongoDB indexes
+def _latest_per_user_index() -> IndexModel:
+    return IndexModel([("user_id", ASCENDING), ("timestamp", DESCENDING)], name="user_id_1_timestamp_-1")
+
+def _id_index() -> IndexModel:
+    return IndexModel([("id", ASCENDING)], name="id_1", unique=True)
+
+MONGO_INDEXES = {
+    "users": [_id_index()],
+    "resume_analyses": [_latest_per_user_index(), _id_index()],
+    "survey_responses": [_latest_per_user_index()],
+    "career_scores": [
+        _latest_per_user_index(),
+        IndexModel([("user_id", ASCENDING), ("career_path", ASCENDING), ("timestamp", DESCENDING)],
+                   name="user_id_1_career_path_1_timestamp_-1"),
+        _id_index()
+    ],
+    "progress_logs": [_latest_per_user_index(), _id_index()],
+    "career_selections": [_latest_per_user_index()],
+    "user_score_summaries": [IndexModel([("user_id", ASCENDING)], name="user_id_1", unique=True)],
+    "resume_analysis_cache": [
+        IndexModel([("key", ASCENDING)], name="key_1", unique=True),
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0)
+    ],
+    "analysis_jobs": [
+        _id_index(),
+        IndexModel([("status", ASCENDING), ("visible_at", ASCENDING)], name="status_1_visible_at_1")
+    ]
+}
+
+# (collection, filter, sort) for every query on a request path; checked by verify_query_plans
+HOT_QUERIES = [
+    ("resume_analyses", {"user_id": "plan-check"}, [("timestamp", -1)]),
+    ("resume_analyses", {"id": "plan-check"}, None),
+    ("survey_responses", {"user_id": "plan-check"}, [("timestamp", -1)]),
+    ("career_scores", {"user_id": "plan-check"}, [("timestamp", -1)]),
+    ("career_scores", {"user_id": "plan-check", "career_path": "plan-check"}, [("timestamp", -1)]),
+    ("career_scores", {"id": "plan-check"}, None),
+    ("progress_logs", {"user_id": "plan-check"}, [("timestamp", -1)]),
+    ("career_selections", {"user_id": "plan-check"}, [("timestamp", -1)]),
+    ("user_score_summaries", {"user_id": "plan-check"}, None),
+    ("user_score_summaries", {"user_id": "plan-check", "career_path": "plan-check"}, None),
+    ("resume_analysis_cache", {"key": "plan-check", "expires_at": {"$gt": datetime(1970, 1, 1)}}, None),
+    ("analysis_jobs", {"id": "plan-check"}, None),
+    ("analysis_jobs", {"status": {"$in": ["queued", "running"]}, "visible_at": {"$lte": datetime(1970, 1, 1)}},
+     [("visible_at", 1)])
+]
+
+async def ensure_indexes():
+    """Create every declared index; create_indexes is a no-op for indexes that already exist"""
+    for collection_name, indexes in MONGO_INDEXES.items():
+        try:
+            await db[collection_name].create_indexes(indexes)
+        except Exception as e:
+            logger.error("Failed to create indexes", extra={"fields": {"collection": collection_name, "error": repr(e)}})
+
+def _plan_stages(plan: Any) -> List[str]:
+    if isinstance(plan, dict):
+        stages = [plan["stage"]] if "stage" in plan else []
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+        return stages
+    if isinstance(plan, list):
+        return [stage for item in plan for stage in _plan_stages(item)]
+    return []
+
+async def verify_query_plans():
+    """Explain every hot query and raise if any falls back to a collection scan or an in-memory sort"""
+    problems = []
+    for collection_name, query, sort in HOT_QUERIES:
+        cursor = db[collection_name].find(query).limit(1)
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = await cursor.explain()
+        stages = _plan_stages(explanation["queryPlanner"]["winningPlan"])
+        bad_stages = sorted({stage for stage in stages if stage in ("COLLSCAN", "SORT")})
+        if bad_stages:
+            problems.append(f"{collection_name} {query} sort={sort}: {', '.join(bad_stages)}")
+    if problems:
+        raise RuntimeError("Hot queries are not served by indexes:\n" + "\n".join(problems))
+
+# Field projections for every read, so whole documents (and ObjectIds) are not shipped from MongoDB
+ANALYSIS_PROJECTION = {"_id": 0}
+ANALYSIS_SUMMARY_PROJECTION = {"_id": 0, "id": 1, "career_suggestions": 1, "extracted_skills": 1, "experience_level": 1, "timestamp": 1}
+ANALYSIS_SCORING_PROJECTION = {"_id": 0, "extracted_skills": 1, "experience_level": 1, "resume_text_hash": 1}
+SURVEY_PROJECTION = {"_id": 0, "responses": 1, "timestamp": 1}
+LOG_PROJECTION = {"_id": 0, "id": 1, "career_path": 1, "log_entry": 1, "activities_completed": 1, "skills_improved": 1, "timestamp": 1}
+SELECTION_PROJECTION = {"_id": 0, "selected_career_path": 1, "timestamp": 1}
+
+async def find_latest(collection, user_id: str, projection: Dict[str, int]) -> Optional[Dict[str, Any]]:
+    """The user's most recent document in a collection, restricted to the projected fields"""
+    return await collection.find_one({"user_id": user_id}, projection=projection, sort=[("timestamp", -1)])
+
+# Per-user score summary: a copy of the user's latest career score, kept current as progress is logged
+async def save_score_summary(career_score: CareerScore):
+    await db.user_score_summaries.replace_one(
+        {"user_id": career_score.user_id},
+        career_score.dict(),
+        upsert=True
+    )
+
+async def get_score_summary(user_id: str) -> Optional[Dict[str, Any]]:
+    summary = await db.user_score_summaries.find_one({"user_id": user_id}, projection={"_id": 0})
+    if summary is not None:
+        return summary
+    
+    # Users scored before summaries existed: build theirs from career_scores once
+    latest_score = await db.career_scores.find_one(
+        {"user_id": user_id},
+        sort=[("timestamp", -1)],
+        projection={"_id": 0}
+    )
+    if latest_score is not None:
+        await db.user_score_summaries.update_one(
+            {"user_id": user_id},
+            {"$setOnInsert": {key: value for key, value in latest_score.items() if key != "user_id"}},
+            upsert=True
+        )
+    return latest_score
+
+# Job listings
+class JobListingProvider(ABC):
+    """Source of job listings for a career path; a real job-feed client can replace the mock behind this interface"""
+
+    @abstractmethod
+    async def get_jobs(self, career_path: str) -> List[Dict[str, Any]]:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+# Templates for the generated listings: (title, company, location, description, requirements, salary range)
+MOCK_JOB_TEMPLATES = [
+    ("Senior {path}", "Tech Corp", "San Francisco, CA",
+     "Exciting opportunity for an experienced {path} to join our team...",
+     ["5+ years experience", "Strong communication skills", "Team player"], "$80,000 - $120,000"),
+    ("Junior {path}", "Innovation Inc", "New York, NY",
+     "Entry-level position for aspiring {path}...",
+     ["1-2 years experience", "Eagerness to learn", "Bachelor's degree"], "$50,000 - $70,000"),
+    ("{path} Manager", "Growth LLC", "Remote",
+     "Lead a team of {path}s in this management role...",
+     ["7+ years experience", "Management experience", "Leadership skills"], "$100,000 - $140,000"),
+]
+
+MOCK_JOB_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "/api/mock-jobs")
+
+class MockJobListingProvider(JobListingProvider):
+    """Templated listings, built once per career path and kept in a bounded LRU.
+
+    Ids are uuid5 of the career path and template slot, so the same path always yields the same jobs.
+    Returned lists are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _build(self, career_path: str) -> List[Dict[str, Any]]:
+        created_at = datetime.utcnow()
+        return [
+            JobListing(
+                id=str(uuid.uuid5(MOCK_JOB_ID_NAMESPACE, f"{career_path}/{slot}")),
+                title=title.format(path=career_path),
+                company=company,
+                location=location,
+                description=description.format(path=career_path),
+                requirements=list(requirements),
+                salary_range=salary_range,
+                url=f"https://example.com/job{slot + 1}",
+                career_path=career_path,
+                timestamp=created_at
+            ).dict()
+            for slot, (title, company, location, description, requirements, salary_range) in enumerate(MOCK_JOB_TEMPLATES)
+        ]
+
+    async def get_jobs(self, career_path: str) -> List[Dict[str, Any]]:
+        jobs = self._entries.get(career_path)
+        if jobs is not None:
+            self._entries.move_to_end(career_path)
+            self.counters["hits"] += 1
+            return jobs
+
+        self.counters["misses"] += 1
+        jobs = self._build(career_path)
+        self._entries[career_path] = jobs
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+        return jobs
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["hits"] + self.counters["misses"]
         return {
-            "current_score": 65,
-            "skill_gaps": ["Technical Skills", "Industry Experience"],
-            "strength_areas": ["Communication", "Problem Solving"],
-            "recommendations": [
-                "Complete online courses",
-                "Build a portfolio",
-                "Join professional communities"
-            ]
+            **self.counters,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": self.counters["hits"] / lookups if lookups else 0.0
+        }
+
+# Job search index
+JOB_INDEX_FORMAT_VERSION = 2
+
+# Term frequency weight per field: a skill in the title says more than one buried in the description
+JOB_INDEX_FIELD_WEIGHTS = {"title": 3.0, "requirements": 2.0, "description": 1.0}
+
+JOB_INDEX_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "of", "on", "or",
+    "our", "the", "to", "we", "with", "you", "your",
+})
+
+JOB_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+def tokenize_job_text(text: str) -> List[str]:
+    return [token for token in JOB_TOKEN_PATTERN.findall(text.lower()) if token not in JOB_INDEX_STOPWORDS]
+
+def normalize_job_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """One feed record as a JSON-ready JobListing dict, with a stable id when the feed has none"""
+    requirements = record.get("requirements") or []
+    if isinstance(requirements, str):
+        requirements = [requirements]
+    job_id = record.get("id") or str(uuid.uuid5(
+        MOCK_JOB_ID_NAMESPACE, record.get("url") or f"{record.get('title')}/{record.get('company')}"
+    ))
+    return JobListing(
+        id=str(job_id),
+        title=record["title"],
+        company=record.get("company") or "",
+        location=record.get("location") or "",
+        description=record.get("description") or "",
+        requirements=[str(requirement) for requirement in requirements],
+        salary_range=record.get("salary_range"),
+        url=record.get("url") or "",
+        career_path=record.get("career_path") or "",
+        **({"timestamp": record["timestamp"]} if record.get("timestamp") else {})
+    ).model_dump(mode="json")
+
+class JobSearchIndex:
+    """In-memory inverted index over job title, requirements and description, ranked with BM25.
+
+    Postings are kept CSR-style: the documents containing term i are doc_ids[offsets[i]:offsets[i + 1]],
+    with their field-weighted term frequencies alongside, so scoring a query is a few numpy scatter-adds.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, documents: List[Dict[str, Any]], terms: List[str], offsets: np.ndarray,
+                 doc_ids: np.ndarray, term_freqs: np.ndarray, doc_lengths: np.ndarray):
+        self.documents = documents
+        self.term_ids = {term: term_id for term_id, term in enumerate(terms)}
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        average_length = float(doc_lengths.mean()) if len(doc_lengths) else 1.0
+        # Per-document part of the BM25 denominator, computed once instead of per query
+        self.length_norms = (self.K1 * (1 - self.B + self.B * doc_lengths / average_length)).astype(np.float32)
+        document_counts = np.diff(offsets).astype(np.float64)
+        self.idf = np.log(1 + (len(documents) - document_counts + 0.5) / (document_counts + 0.5)).astype(np.float32)
+
+    @classmethod
+    def empty(cls) -> "JobSearchIndex":
+        return cls([], [], np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32),
+                   np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32))
+
+    @classmethod
+    def build(cls, records) -> "JobSearchIndex":
+        documents = []
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        doc_lengths = []
+        for position, record in enumerate(records):
+            try:
+                document = normalize_job_record(record)
+            except (ValidationError, TypeError) as e:
+                # A record with a usable title can still carry fields of the wrong type; one bad record must not abort the ingest
+                logger.warning("Skipping invalid job record", extra={"fields": {"record": position, "error": repr(e)}})
+                continue
+            doc_id = len(documents)
+            documents.append(document)
+
+            weighted_counts: Dict[str, float] = {}
+            fields = {
+                "title": document["title"],
+                "requirements": " ".join(document["requirements"]),
+                "description": document["description"],
+            }
+            for field, text in fields.items():
+                weight = JOB_INDEX_FIELD_WEIGHTS[field]
+                for token in tokenize_job_text(text):
+                    weighted_counts[token] = weighted_counts.get(token, 0.0) + weight
+            for term, count in weighted_counts.items():
+                postings.setdefault(term, []).append((doc_id, count))
+            doc_lengths.append(sum(weighted_counts.values()))
+
+        terms = sorted(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(postings[term]) for term in terms])
+        doc_ids = np.fromiter((doc_id for term in terms for doc_id, _ in postings[term]), dtype=np.int32, count=offsets[-1])
+        term_freqs = np.fromiter((count for term in terms for _, count in postings[term]), dtype=np.float32, count=offsets[-1])
+        return cls(documents, terms, offsets, doc_ids, term_freqs, np.asarray(doc_lengths, dtype=np.float32))
+
+    @classmethod
+    def from_jsonl(cls, path: str) -> "JobSearchIndex":
+        """Bulk ingest a JSONL job feed; malformed lines are logged and skipped"""
+        def records():
+            with open(path, "rb") as feed:
+                for line_number, line in enumerate(feed, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = orjson.loads(line)
+                        if not record.get("title"):
+                            raise ValueError("missing title")
+                    except (orjson.JSONDecodeError, ValueError, AttributeError) as e:
+                        logger.warning("Skipping job feed line", extra={"fields": {"line": line_number, "error": repr(e)}})
+                        continue
+                    yield record
+        return cls.build(records())
+
+    def save(self, path: str):
+        """Write the index to one .npz file, atomically replacing any previous version"""
+        terms = [None] * len(self.term_ids)
+        for term, term_id in self.term_ids.items():
+            terms[term_id] = term
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=Path(path).parent, suffix=".tmp", delete=False) as tmp:
+            np.savez(
+                tmp,
+                format_version=np.array(JOB_INDEX_FORMAT_VERSION),
+                # orjson bytes, not a fixed-width unicode array that pads every term to the longest one
+                terms=np.frombuffer(orjson.dumps(terms), dtype=np.uint8),
+                offsets=self.offsets,
+                doc_ids=self.doc_ids,
+                term_freqs=self.term_freqs,
+                doc_lengths=self.doc_lengths,
+                documents=np.frombuffer(orjson.dumps(self.documents), dtype=np.uint8)
+            )
+        os.replace(tmp.name, path)
+
+    @classmethod
+    def load(cls, path: str) -> "JobSearchIndex":
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != JOB_INDEX_FORMAT_VERSION:
+                raise ValueError(f"Unsupported job index format {int(data['format_version'])}")
+            return cls(
+                orjson.loads(data["documents"].tobytes()),
+                orjson.loads(data["terms"].tobytes()),
+                data["offsets"],
+                data["doc_ids"],
+                data["term_freqs"],
+                data["doc_lengths"]
+            )
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def search(self, career_path: str, skills: Optional[List[str]] = None, limit: int = JOB_SEARCH_DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """Top `limit` jobs for a career path and skill set, best first, each with its BM25 score"""
+        query_counts: Dict[int, int] = {}
+        for token in tokenize_job_text(" ".join([career_path, *(skills or [])])):
+            term_id = self.term_ids.get(token)
+            if term_id is not None:
+                query_counts[term_id] = query_counts.get(term_id, 0) + 1
+        if not query_counts or limit <= 0:
+            return []
+
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        for term_id, query_count in query_counts.items():
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            ids = self.doc_ids[start:end]
+            tf = self.term_freqs[start:end]
+            # Each document appears once per term, so plain fancy-index addition is safe
+            scores[ids] += query_count * self.idf[term_id] * tf * (self.K1 + 1) / (tf + self.length_norms[ids])
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(scores[candidates], -limit)[-limit:]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [{**self.documents[doc_id], "score": float(scores[doc_id])} for doc_id in ranked]
+
+class IndexedJobListingProvider(JobListingProvider):
+    """Listings ranked from the job search index, falling back to another provider when nothing matches"""
+
+    def __init__(self, index: JobSearchIndex, fallback: JobListingProvider, limit: int):
+        self.index = index
+        self.fallback = fallback
+        self.limit = limit
+
+    async def get_jobs(self, career_path: str) -> List[Dict[str, Any]]:
+        jobs = self.index.search(career_path, limit=self.limit)
+        if jobs:
+            return jobs
+        FALLBACK_TOTAL.labels(path="mock_job_listings").inc()
+        return await self.fallback.get_jobs(career_path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"indexed_jobs": len(self.index), "fallback": self.fallback.stats()}
+
+job_listing_provider = IndexedJobListingProvider(
+    JobSearchIndex.empty(),
+    MockJobListingProvider(JOB_LISTING_CACHE_MAX_ENTRIES),
+    JOB_SEARCH_DEFAULT_LIMIT
+)
+
+def load_job_search_index() -> Optional[JobSearchIndex]:
+    """The persisted index if there is one, otherwise one built from the configured feed (and saved for next time)"""
+    if os.path.exists(JOB_INDEX_PATH):
+        try:
+            return JobSearchIndex.load(JOB_INDEX_PATH)
+        except ValueError as e:
+            # An index written in an older format is rebuilt from the feed when there is one
+            if not JOB_FEED_PATH:
+                raise
+            logger.warning("Rebuilding the job search index", extra={"fields": {"path": JOB_INDEX_PATH, "error": repr(e)}})
+    if JOB_FEED_PATH:
+        index = JobSearchIndex.from_jsonl(JOB_FEED_PATH)
+        index.save(JOB_INDEX_PATH)
+        return index
+    return None
+
+# Static catalogs: serialized once, served with a content-hash ETag
+class StaticCatalog:
+    """Immutable JSON body with a strong ETag derived from its bytes, so any change to the table is a new version"""
+
+    def __init__(self, content: Dict[str, Any], max_age_seconds: int):
+        self.body = orjson.dumps(content)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={max_age_seconds}"
         }
 
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # If-None-Match uses weak comparison, so a proxy's W/ prefix still matches
+        return "*" in candidates or any(tag.removeprefix("W/") == self.etag for tag in candidates)
+
+    def response(self, request: Request) -> Response:
+        if self.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
+
+SURVEY_QUESTIONS_CATALOG = StaticCatalog({"questions": SURVEY_QUESTIONS}, CATALOG_MAX_AGE_SECONDS)
+CAREER_PATHS_CATALOG = StaticCatalog({"career_paths": CAREER_PATHS}, CATALOG_MAX_AGE_SECONDS)
+
 # Routes
 
 @api_router.post("/users", response_model=User)
@@ -732,7 +2967,7 @@ async def create_user(email: Optional[str] = None):
     await db.users.insert_one(user.dict())
     return user
 
-@api_router.post("/upload-resume")
+@api_router.post("/upload-resume", response_model=ResumeUploadResponse, status_code=202)
 async def upload_resume(
     user_id: str = Form(...),
     file: UploadFile = File(...)
@@ -741,55 +2976,163 @@ async def upload_resume(
     if not file.filename.lower().endswith(('.pdf', '.txt')):
         raise HTTPException(status_code=400, detail="Only PDF and TXT files are supported")
     
-    # Read file content
-    content = await file.read()
-    
     # Extract text based on file type
-    if file.filename.lower().endswith('.pdf'):
-        resume_text = await extract_text_from_pdf(content)
-    else:
-        resume_text = content.decode('utf-8')
-    
-    # Analyze with AI
-    analysis_result = await analyze_resume_with_ai(resume_text)
-    
-    # Create analysis response
-    analysis = ResumeAnalysisResponse(
-        user_id=user_id,
-        career_suggestions=[CareerSuggestion(**suggestion) for suggestion in analysis_result["career_suggestions"]],
-        extracted_skills=analysis_result["extracted_skills"],
-        experience_level=analysis_result["experience_level"]
+    resume_text = await extract_resume_text(file)
+    
+    # Keep the full text once so downstream scoring can reuse it without re-extracting
+    resume_text_hash = await resume_text_store.put(resume_text)
+    
+    # Answer with the offline analysis now and queue the LLM refinement; the job endpoints report the upgrade
+    analysis = await create_local_analysis(user_id, resume_text, resume_text_hash)
+    deadline_at = analysis.timestamp + timedelta(seconds=ANALYSIS_REFINEMENT_DEADLINE_SECONDS)
+    job = await analysis_job_queue.enqueue(user_id, resume_text_hash, analysis.id, deadline_at)
+    
+    return ResumeUploadResponse(
+        analysis=analysis,
+        job_id=job.id,
+        status=job.status,
+        status_url=f"/api/analysis-jobs/{job.id}",
+        events_url=f"/api/analysis-jobs/{job.id}/events"
     )
+
+# Streamed refinements still running; referenced here so a client disconnect cannot let them be garbage collected
+stream_refinements: set = set()
+
+@api_router.post("/upload-resume/stream")
+async def upload_resume_stream(
+    request: Request,
+    user_id: str = Form(...),
+    file: UploadFile = File(...)
+):
+    """Upload a resume and stream the analysis: the local analysis first, then each LLM suggestion as it is generated.
+
+    Sends Server-Sent Events when the client accepts text/event-stream, NDJSON otherwise. A refinement job is
+    queued up front and held back by a heartbeat while the stream runs, so the LLM result is never lost and never
+    requested twice: the stream's task outlives a disconnected client and finishes the job itself, and if the LLM
+    fails or the process dies the job becomes visible to the workers. On LLM failure the job's URLs are sent as the last event.
+    """
+    if not file.filename.lower().endswith(('.pdf', '.txt')):
+        raise HTTPException(status_code=400, detail="Only PDF and TXT files are supported")
     
-    # Store in database
-    await db.resume_analyses.insert_one(analysis.dict())
-    
-    return analysis
+    resume_text = await extract_resume_text(file)
+    resume_text_hash = await resume_text_store.put(resume_text)
+    analysis = await create_local_analysis(user_id, resume_text, resume_text_hash)
+    deadline_at = analysis.timestamp + timedelta(seconds=ANALYSIS_REFINEMENT_DEADLINE_SECONDS)
+    job = await analysis_job_queue.enqueue(
+        user_id, resume_text_hash, analysis.id, deadline_at,
+        visible_at=datetime.utcnow() + timedelta(seconds=ANALYSIS_STREAM_HOLD_SECONDS)
+    )
+    use_sse = "text/event-stream" in request.headers.get("accept", "")
+
+    def encode(event: str, data: Dict[str, Any]) -> bytes:
+        if use_sse:
+            return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+        return orjson.dumps({"event": event, **data}) + b"\n"
+
+    async def refine(queue: asyncio.Queue):
+        async for event, data in stream_resume_analysis(resume_text):
+            if event == "suggestion":
+                await queue.put(encode("suggestion", {"suggestion": data}))
+                continue
+            await apply_llm_analysis(analysis.id, data)
+            await analysis_job_queue.complete(job.id)
+            refined = await db.resume_analyses.find_one({"id": analysis.id}, projection=ANALYSIS_PROJECTION)
+            await queue.put(encode("analysis", {"analysis": ResumeAnalysisResponse(**refined).model_dump(mode="json")}))
+
+    async def hold_job():
+        # Heartbeat for the held-back job: a worker only sees it once this task stops, e.g. because the process died
+        while True:
+            await asyncio.sleep(ANALYSIS_STREAM_HOLD_SECONDS / 3)
+            try:
+                await analysis_job_queue.hold(job.id, datetime.utcnow() + timedelta(seconds=ANALYSIS_STREAM_HOLD_SECONDS))
+            except Exception as e:
+                logger.warning("Refinement job hold failed", extra={"fields": {"job_id": job.id, "error": repr(e)}})
+
+    async def produce(queue: asyncio.Queue):
+        # Owns the LLM stream and the refinement; it runs detached from the response so a disconnect cannot cancel it
+        heartbeat = asyncio.create_task(hold_job())
+        try:
+            remaining_seconds = (deadline_at - datetime.utcnow()).total_seconds()
+            try:
+                await asyncio.wait_for(refine(queue), timeout=max(remaining_seconds, 0))
+            finally:
+                # Stopped before the job is completed or released, so no late heartbeat hides it again
+                heartbeat.cancel()
+        except asyncio.TimeoutError:
+            await analysis_job_queue.complete(job.id, "Refinement deadline passed; local analysis is final")
+            await queue.put(encode("final", {"analysis_tier": "local", "error": "Refinement deadline passed; local analysis is final"}))
+        except Exception as e:
+            logger.warning("Streaming analysis failed, releasing the refinement job", extra={"fields": {
+                "analysis_id": analysis.id, "job_id": job.id, "error": repr(e)
+            }})
+            await analysis_job_queue.release(job.id)
+            await queue.put(encode("refinement", {
+                "job_id": job.id,
+                "status_url": f"/api/analysis-jobs/{job.id}",
+                "events_url": f"/api/analysis-jobs/{job.id}/events"
+            }))
+        finally:
+            await queue.put(None)
+
+    async def events():
+        yield encode("analysis", {"analysis": analysis.model_dump(mode="json")})
+        queue: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(produce(queue))
+        stream_refinements.add(producer)
+        producer.add_done_callback(stream_refinements.discard)
+        while (message := await queue.get()) is not None:
+            yield message
 
-@api_router.post("/enhanced-career-suggestions")
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@api_router.get("/analysis-jobs/{job_id}", response_model=AnalysisJobStatus)
+async def get_analysis_job(job_id: str):
+    return await get_analysis_job_status(job_id)
+
+@api_router.get("/analysis-jobs/{job_id}/events")
+async def stream_analysis_job(job_id: str):
+    """Server-Sent Events stream of job status changes, ending with the analysis result"""
+    # Fail fast with a 404 instead of opening a stream for an unknown job
+    await get_analysis_job_status(job_id)
+
+    async def events():
+        deadline = time.monotonic() + ANALYSIS_JOB_STREAM_TIMEOUT_SECONDS
+        last_status = None
+        while time.monotonic() < deadline:
+            job_status = await get_analysis_job_status(job_id)
+            if job_status.status != last_status:
+                last_status = job_status.status
+                event = "result" if job_status.status in ("done", "failed") else "status"
+                yield f"event: {event}\ndata: {job_status.model_dump_json()}\n\n"
+                if event == "result":
+                    return
+            else:
+                # Comment line keeps idle proxies from closing the connection
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(ANALYSIS_JOB_POLL_INTERVAL_SECONDS)
+        yield "event: timeout\ndata: {}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@api_router.post("/enhanced-career-suggestions", response_model=ResumeAnalysisResponse)
 async def get_enhanced_career_suggestions(user_id: str = Form(...)):
     """Get career suggestions enhanced with survey responses"""
     # Get user's latest resume analysis
-    latest_analysis = await db.resume_analyses.find_one(
-        {"user_id": user_id},
-        sort=[("timestamp", -1)]
-    )
+    latest_analysis = await find_latest(db.resume_analyses, user_id, ANALYSIS_PROJECTION)
     
     if not latest_analysis:
         raise HTTPException(status_code=404, detail="No resume analysis found for user")
     
     # Get user's survey responses
-    latest_survey = await db.survey_responses.find_one(
-        {"user_id": user_id},
-        sort=[("timestamp", -1)]
-    )
+    latest_survey = await find_latest(db.survey_responses, user_id, SURVEY_PROJECTION)
     
     if not latest_survey:
         # No survey data, return original analysis
         return latest_analysis
     
-    # Extract resume text from skills and experience level (simplified)
-    resume_text = f"Skills: {', '.join(latest_analysis['extracted_skills'])}\nExperience Level: {latest_analysis['experience_level']}"
+    # Reuse the stored resume text
+    resume_text = await load_resume_text(latest_analysis)
     
     # Get enhanced suggestions using survey data
     enhanced_analysis = await analyze_resume_with_survey(resume_text, latest_survey['responses'])
@@ -799,39 +3142,42 @@ async def get_enhanced_career_suggestions(user_id: str = Form(...)):
         user_id=user_id,
         career_suggestions=[CareerSuggestion(**suggestion) for suggestion in enhanced_analysis["career_suggestions"]],
         extracted_skills=enhanced_analysis["extracted_skills"],
-        experience_level=enhanced_analysis["experience_level"]
+        experience_level=enhanced_analysis["experience_level"],
+        resume_text_hash=latest_analysis.get("resume_text_hash"),
+        analysis_tier=enhanced_analysis["analysis_tier"]
     )
     
-    # Update original analysis with enhanced suggestions
+    # Update original analysis with enhanced suggestions; the survey tier also fences off a pending LLM
+    # refinement, which only replaces documents still on the local tier
     await db.resume_analyses.update_one(
         {"id": latest_analysis["id"]},
-        {"$set": {"career_suggestions": [s.dict() for s in analysis.career_suggestions]}}
+        {"$set": {
+            "career_suggestions": [s.dict() for s in analysis.career_suggestions],
+            "analysis_tier": analysis.analysis_tier
+        }}
     )
     
     return analysis
 
 @api_router.get("/career-paths")
-async def get_career_paths():
-    return {"career_paths": CAREER_PATHS}
+async def get_career_paths(request: Request):
+    return CAREER_PATHS_CATALOG.response(request)
 
 @api_router.post("/select-career-path")
 async def select_career_path(selection: CareerPathSelection):
     await db.career_selections.insert_one(selection.dict())
     return {"message": "Career path selected successfully"}
 
-@api_router.post("/calculate-career-score")
+@api_router.post("/calculate-career-score", response_model=CareerScore)
 async def calculate_career_score(user_id: str = Form(...), career_path: str = Form(...)):
     # Get user's latest resume analysis
-    latest_analysis = await db.resume_analyses.find_one(
-        {"user_id": user_id},
-        sort=[("timestamp", -1)]
-    )
+    latest_analysis = await find_latest(db.resume_analyses, user_id, ANALYSIS_SCORING_PROJECTION)
     
     if not latest_analysis:
         raise HTTPException(status_code=404, detail="No resume analysis found for user")
     
-    # Get resume text (for now, we'll use extracted skills as proxy)
-    resume_text = f"Skills: {', '.join(latest_analysis['extracted_skills'])}\nExperience Level: {latest_analysis['experience_level']}"
+    # Get the stored resume text
+    resume_text = await load_resume_text(latest_analysis)
     
     # Calculate score with AI
     score_result = await calculate_career_score_with_ai(resume_text, career_path)
@@ -848,179 +3194,152 @@ async def calculate_career_score(user_id: str = Form(...), career_path: str = Fo
     
     # Store in database
     await db.career_scores.insert_one(career_score.dict())
+    await save_score_summary(career_score)
     
     return career_score
 
-@api_router.post("/progress-log")
-async def add_progress_log(log: ProgressLog):
-    await db.progress_logs.insert_one(log.dict())
+@api_router.post("/calculate-career-scores", response_model=CareerScoreBatchResponse)
+async def calculate_career_scores(request: CareerScoreBatchRequest):
+    """Score several career paths at once with as few LLM calls as possible"""
+    # Replies are matched back case-insensitively, so paths are deduplicated the same way; the first spelling wins
+    unique_paths: Dict[str, str] = {}
+    for path in request.career_paths:
+        if path.strip():
+            unique_paths.setdefault(path.strip().lower(), path.strip())
+    career_paths = list(unique_paths.values())
+    if not career_paths:
+        raise HTTPException(status_code=400, detail="At least one career path is required")
+    if len(career_paths) > CAREER_SCORE_BATCH_MAX_PATHS:
+        raise HTTPException(status_code=400, detail=f"At most {CAREER_SCORE_BATCH_MAX_PATHS} career paths can be scored at once")
+    
+    latest_analysis = await find_latest(db.resume_analyses, request.user_id, ANALYSIS_SCORING_PROJECTION)
     
-    # Update career score based on progress
-    latest_score = await db.career_scores.find_one(
-        {"user_id": log.user_id, "career_path": log.career_path},
-        sort=[("timestamp", -1)]
-    )
+    if not latest_analysis:
+        raise HTTPException(status_code=404, detail="No resume analysis found for user")
     
-    if latest_score:
-        # Simple score improvement based on activities
-        improvement = len(log.activities_completed) * 2 + len(log.skills_improved) * 3
-        new_score = min(100, latest_score["current_score"] + improvement)
-        
-        # Update the score
-        await db.career_scores.update_one(
-            {"id": latest_score["id"]},
-            {"$set": {"current_score": new_score}}
+    resume_text = await load_resume_text(latest_analysis)
+    score_results = await calculate_career_scores_with_ai(resume_text, career_paths)
+    
+    career_scores = [
+        CareerScore(
+            user_id=request.user_id,
+            career_path=career_path,
+            current_score=score_results[career_path]["current_score"],
+            skill_gaps=score_results[career_path]["skill_gaps"],
+            strength_areas=score_results[career_path]["strength_areas"],
+            recommendations=score_results[career_path]["recommendations"]
         )
+        for career_path in career_paths
+    ]
+    
+    await db.career_scores.insert_many([career_score.dict() for career_score in career_scores])
+    await save_score_summary(max(career_scores, key=lambda career_score: career_score.timestamp))
+    
+    return CareerScoreBatchResponse(scores=career_scores)
+
+@api_router.post("/progress-log")
+async def add_progress_log(log: ProgressLog):
+    # Simple score improvement based on activities
+    improvement = len(log.activities_completed) * 2 + len(log.skills_improved) * 3
+    
+    # Server-side increment capped at 100, so concurrent logs cannot overwrite each other
+    score_update = [{"$set": {"current_score": {"$min": [100, {"$add": ["$current_score", improvement]}]}}}]
+    
+    # The log insert, score update and summary update run concurrently as three separate round trips
+    await asyncio.gather(
+        db.progress_logs.insert_one(log.dict()),
+        db.career_scores.find_one_and_update(
+            {"user_id": log.user_id, "career_path": log.career_path},
+            score_update,
+            sort=[("timestamp", -1)]
+        ),
+        db.user_score_summaries.update_one(
+            {"user_id": log.user_id, "career_path": log.career_path},
+            score_update
+        )
+    )
     
     return {"message": "Progress logged successfully"}
 
-@api_router.get("/user-progress/{user_id}")
+@api_router.get("/user-progress/{user_id}", response_model=UserProgressResponse)
 async def get_user_progress(user_id: str):
     # Get latest career score
-    latest_score = await db.career_scores.find_one(
-        {"user_id": user_id},
-        sort=[("timestamp", -1)]
-    )
+    latest_score = await get_score_summary(user_id)
     
     # Get recent progress logs
     progress_logs = await db.progress_logs.find(
         {"user_id": user_id},
+        projection=LOG_PROJECTION,
         sort=[("timestamp", -1)],
         limit=10
     ).to_list(10)
     
-    # Convert ObjectIds to strings for JSON serialization
-    if latest_score and "_id" in latest_score:
-        latest_score["_id"] = str(latest_score["_id"])
-    
-    for log in progress_logs:
-        if "_id" in log:
-            log["_id"] = str(log["_id"])
+    return UserProgressResponse(career_score=latest_score, recent_logs=progress_logs)
+
+@api_router.get("/dashboard/{user_id}", response_model=DashboardResponse)
+async def get_user_dashboard(user_id: str):
+    """Everything the dashboard needs in one request, with the MongoDB reads issued concurrently"""
+    analysis, survey, career_score, recent_logs, selection = await asyncio.gather(
+        find_latest(db.resume_analyses, user_id, ANALYSIS_SUMMARY_PROJECTION),
+        find_latest(db.survey_responses, user_id, SURVEY_PROJECTION),
+        get_score_summary(user_id),
+        db.progress_logs.find({"user_id": user_id}, projection=LOG_PROJECTION, sort=[("timestamp", -1)], limit=10).to_list(10),
+        find_latest(db.career_selections, user_id, SELECTION_PROJECTION)
+    )
     
-    return {
-        "career_score": latest_score,
-        "recent_logs": progress_logs
-    }
+    return DashboardResponse(
+        analysis=analysis,
+        survey=survey,
+        career_score=career_score,
+        recent_logs=recent_logs,
+        selected_career_path=selection["selected_career_path"] if selection else None
+    )
 
 @api_router.get("/mock-jobs/{career_path:path}")
 async def get_mock_jobs(career_path: str):
     """Mock job listings - in real implementation would use LinkedIn API"""
     # Handle URL-encoded career paths
     career_path = career_path.replace("%20", " ")
-    mock_jobs = [
-        JobListing(
-            title=f"Senior {career_path}",
-            company="Tech Corp",
-            location="San Francisco, CA",
-            description=f"Exciting opportunity for an experienced {career_path} to join our team...",
-            requirements=["5+ years experience", "Strong communication skills", "Team player"],
-            salary_range="$80,000 - $120,000",
-            url="https://example.com/job1",
-            career_path=career_path
-        ),
-        JobListing(
-            title=f"Junior {career_path}",
-            company="Innovation Inc",
-            location="New York, NY",
-            description=f"Entry-level position for aspiring {career_path}...",
-            requirements=["1-2 years experience", "Eagerness to learn", "Bachelor's degree"],
-            salary_range="$50,000 - $70,000",
-            url="https://example.com/job2",
-            career_path=career_path
-        ),
-        JobListing(
-            title=f"{career_path} Manager",
-            company="Growth LLC",
-            location="Remote",
-            description=f"Lead a team of {career_path}s in this management role...",
-            requirements=["7+ years experience", "Management experience", "Leadership skills"],
-            salary_range="$100,000 - $140,000",
-            url="https://example.com/job3",
-            career_path=career_path
-        )
-    ]
-    
-    return {"jobs": [job.dict() for job in mock_jobs]}
+    return {"jobs": await job_listing_provider.get_jobs(career_path)}
+
+@api_router.get("/jobs/search", response_model=JobSearchResponse)
+async def search_jobs(career_path: str, user_id: Optional[str] = None, skills: Optional[List[str]] = Query(None),
+                      limit: int = JOB_SEARCH_DEFAULT_LIMIT):
+    """Rank indexed job postings for a career path, using the user's extracted and suggested key skills when given"""
+    query_skills = list(skills or [])
+    if user_id:
+        analysis = await find_latest(db.resume_analyses, user_id, ANALYSIS_SUMMARY_PROJECTION)
+        if analysis:
+            query_skills += analysis["extracted_skills"]
+            for suggestion in analysis["career_suggestions"]:
+                if suggestion["career_path"] == career_path:
+                    query_skills += suggestion["key_skills"]
+
+    limit = max(1, min(limit, JOB_SEARCH_MAX_LIMIT))
+    index = job_listing_provider.index
+    return JobSearchResponse(jobs=index.search(career_path, query_skills, limit), indexed_jobs=len(index))
 
 @api_router.get("/survey-questions")
-async def get_survey_questions():
-    questions = [
-        {
-            "id": 1,
-            "question": "What type of work environment do you prefer?",
-            "type": "multiple_choice",
-            "options": ["Remote", "Office", "Hybrid", "Flexible"]
-        },
-        {
-            "id": 2,
-            "question": "How important is work-life balance to you?",
-            "type": "scale",
-            "min": 1,
-            "max": 5,
-            "labels": ["Not important", "Very important"]
-        },
-        {
-            "id": 3,
-            "question": "What is your preferred company size?",
-            "type": "multiple_choice",
-            "options": ["Startup (1-50)", "Small (51-200)", "Medium (201-1000)", "Large (1000+)"]
-        },
-        {
-            "id": 4,
-            "question": "How comfortable are you with public speaking?",
-            "type": "scale",
-            "min": 1,
-            "max": 5,
-            "labels": ["Very uncomfortable", "Very comfortable"]
-        },
-        {
-            "id": 5,
-            "question": "Do you prefer working independently or in teams?",
-            "type": "multiple_choice",
-            "options": ["Independently", "In teams", "Mix of both"]
-        },
-        {
-            "id": 6,
-            "question": "What motivates you most in your career?",
-            "type": "multiple_choice",
-            "options": ["Financial growth", "Personal growth", "Impact on others", "Creative expression"]
-        },
-        {
-            "id": 7,
-            "question": "How important is job security to you?",
-            "type": "scale",
-            "min": 1,
-            "max": 5,
-            "labels": ["Not important", "Very important"]
-        },
-        {
-            "id": 8,
-            "question": "What industry interests you most?",
-            "type": "multiple_choice",
-            "options": ["Technology", "Healthcare", "Finance", "Education", "Marketing", "Other"]
-        },
-        {
-            "id": 9,
-            "question": "How willing are you to relocate for work?",
-            "type": "scale",
-            "min": 1,
-            "max": 5,
-            "labels": ["Not willing", "Very willing"]
-        },
-        {
-            "id": 10,
-            "question": "What is your ideal career timeline?",
-            "type": "multiple_choice",
-            "options": ["Immediate transition", "6 months", "1 year", "2+ years"]
-        }
-    ]
-    return {"questions": questions}
+async def get_survey_questions(request: Request):
+    return SURVEY_QUESTIONS_CATALOG.response(request)
 
 @api_router.post("/submit-survey")
 async def submit_survey(survey: SurveyResponse):
     await db.survey_responses.insert_one(survey.dict())
     return {"message": "Survey submitted successfully"}
 
+@api_router.get("/cache-stats")
+async def get_cache_stats():
+    return {"resume_analysis": resume_analysis_cache.stats(), "job_listings": job_listing_provider.stats()}
+
+@api_router.get("/llm-stats")
+async def get_llm_stats():
+    return {**llm_gateway.stats(), "single_flight": llm_single_flight.stats(), "structured_output": structured_output_parser.stats()}
+
+@api_router.get("/metrics")
+async def get_metrics():
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 # Basic health check
 @api_router.get("/")
 async def root():
@@ -1029,6 +3348,18 @@ async def root():
 # Include the router in the main app
 app.include_router(api_router)
 
+app.add_middleware(RequestMetricsMiddleware)
+
+if PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        output_dir=PROFILING_DIR,
+        token=PROFILING_TOKEN,
+        max_per_minute=PROFILING_MAX_PER_MINUTE,
+        sample_per_minute=PROFILING_SAMPLE_PER_MINUTE,
+        interval_seconds=PROFILING_INTERVAL_SECONDS
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -1038,12 +3369,97 @@ app.add_middleware(
 )
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+class StructuredFormatter(logging.Formatter):
+    """Renders a record plus its extra={"fields": {...}} as key=value text or as one JSON object per line"""
+
+    def __init__(self, output: str = "text"):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        self.output = output
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "fields", None) or {}
+        if self.output == "json":
+            entry = {"time": self.formatTime(record), "logger": record.name, "level": record.levelname,
+                     "message": record.getMessage(), **fields}
+            if record.exc_text:
+                entry["exception"] = record.exc_text
+            return orjson.dumps(entry, default=str).decode()
+        line = super().format(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value!r}" for key, value in fields.items())
+        return line
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops and counts records when the queue is full instead of blocking the event loop"""
+
+    def __init__(self, record_queue: queue.Queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records are not shared with other handlers, so render the message and traceback in place instead of
+        # copying the record and formatting it twice
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED_TOTAL.inc()
+
+def configure_logging() -> Tuple[DroppingQueueHandler, logging.handlers.QueueListener]:
+    """Route every root logger record through a bounded queue to a listener thread that does the writing"""
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(StructuredFormatter(LOG_FORMAT))
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_MAX_RECORDS))
+    listener = logging.handlers.QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+
+    # The formats never show source location or process details, so skip collecting them for every record
+    logging._srcfile = None
+    logging.logThreads = logging.logProcesses = logging.logMultiprocessing = False
+
+    root_logger = logging.getLogger()
+    root_logger.handlers = [queue_handler]
+    root_logger.setLevel(LOG_LEVEL)
+    listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(listener.stop)
+    return queue_handler, listener
+
+log_queue_handler, log_listener = configure_logging()
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def init_mongo_indexes():
+    await ensure_indexes()
+    if MONGO_VERIFY_QUERY_PLANS:
+        await verify_query_plans()
+
+@app.on_event("startup")
+async def init_job_search_index():
+    started = time.perf_counter()
+    try:
+        index = await asyncio.to_thread(load_job_search_index)
+    except Exception as e:
+        logger.error("Job search index could not be loaded, serving mock listings", extra={"fields": {"error": repr(e)}})
+        return
+    if index is not None:
+        job_listing_provider.index = index
+        logger.info("Job search index ready", extra={"fields": {"jobs": len(index), "elapsed_ms": round((time.perf_counter() - started) * 1000)}})
+
+@app.on_event("startup")
+async def start_analysis_workers():
+    analysis_job_queue.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await analysis_job_queue.stop()
     client.close()
+    pdf_extraction_pool.shutdown()
+    await llm_gateway.aclose()
@@ -144,12 +144,17 @@ class NextObjectiveAPITester:
                 "Upload Resume",
                 "POST",
                 "upload-resume",
-                200,
+                202,
                 files=files,
                 form_data=form_data
             )
             
-            if success and 'id' in response:
+            if success and 'analysis' in response:
+                print(f"Immediate analysis tier: {response['analysis'].get('analysis_tier')}")
+                response = self.wait_for_analysis_job(response['job_id'])
+            
+            if success and response and 'id' in response:
+                print(f"Final analysis tier: {response.get('analysis_tier')}")
                 self.resume_analysis_id = response['id']
                 self.resume_analysis = response  # Store the analysis for later comparison
                 print(f"Resume analyzed with ID: {self.resume_analysis_id}")
@@ -167,6 +172,58 @@ class NextObjectiveAPITester:
                 return True
             return False
 
+    def test_upload_resume_stream(self):
+        """Test the streaming upload: local analysis first, then LLM suggestions or a queued refinement"""
+        self.tests_run += 1
+        print("\n🔍 Testing Streaming Resume Upload...")
+        
+        try:
+            files = {'file': ('stream_resume.txt', b"Data analyst with SQL, Python and Tableau. 3 years of experience.", 'text/plain')}
+            started = time.time()
+            response = requests.post(f"{self.base_url}/api/upload-resume/stream", files=files,
+                                     data={'user_id': self.user_id}, headers={'Accept': 'application/x-ndjson'},
+                                     stream=True, timeout=180)
+            if response.status_code != 200:
+                print(f"❌ Failed - Expected 200, got {response.status_code}")
+                return False
+            
+            events = []
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                message = json.loads(line)
+                events.append(message['event'])
+                print(f"  {time.time() - started:6.2f}s {message['event']}")
+            
+            if not events or events[0] != 'analysis':
+                print("❌ Failed - The first event was not the local analysis")
+                return False
+            if events[-1] not in ('analysis', 'final', 'refinement'):
+                print(f"❌ Failed - Stream ended with unexpected event {events[-1]}")
+                return False
+            
+            self.tests_passed += 1
+            print(f"✅ Passed - {events.count('suggestion')} suggestions streamed")
+            return True
+        except Exception as e:
+            print(f"❌ Failed - Error: {str(e)}")
+            return False
+
+    def wait_for_analysis_job(self, job_id, timeout=120):
+        """Poll an analysis refinement job until it finishes and return the resulting analysis"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            response = requests.get(f"{self.base_url}/api/analysis-jobs/{job_id}")
+            job = response.json()
+            if job['status'] == 'done':
+                return job['analysis']
+            if job['status'] == 'failed':
+                print(f"❌ Analysis job failed: {job.get('error')}")
+                return None
+            time.sleep(1)
+        print(f"❌ Analysis job {job_id} did not finish within {timeout}s")
+        return None
+
     def test_select_career_path(self):
         """Test career path selection"""
         self.selected_career_path = "Software Engineer"  # Using a default career path
@@ -229,6 +286,32 @@ class NextObjectiveAPITester:
             return True
         return False
         
+    def test_calculate_career_scores_batch(self):
+        """Test scoring several career paths in one request"""
+        career_paths = ["Software Engineer", "Data Scientist", "Product Manager"]
+        data = {
+            'user_id': self.user_id,
+            'career_paths': career_paths
+        }
+        
+        success, response = self.run_test(
+            "Calculate Career Scores (Batch)",
+            "POST",
+            "calculate-career-scores",
+            200,
+            data=data
+        )
+        
+        if success and 'scores' in response:
+            for score in response['scores']:
+                print(f"  - {score['career_path']}: {score['current_score']}/100")
+            returned_paths = [score['career_path'] for score in response['scores']]
+            if returned_paths != career_paths:
+                print(f"❌ Expected scores for {career_paths}, got {returned_paths}")
+                return False
+            return True
+        return False
+        
     def test_low_match_career_score(self):
         """Test career score calculation for a likely low-match career"""
         # Use a career path that's likely to have a low match with the test resume
@@ -296,6 +379,26 @@ class NextObjectiveAPITester:
             return True
         return False
         
+    def test_get_user_dashboard(self):
+        """Test getting the combined user dashboard"""
+        success, response = self.run_test(
+            "Get User Dashboard",
+            "GET",
+            f"dashboard/{self.user_id}",
+            200
+        )
+        
+        if success:
+            expected_keys = ['analysis', 'survey', 'career_score', 'recent_logs', 'selected_career_path']
+            missing = [key for key in expected_keys if key not in response]
+            if missing:
+                print(f"❌ Dashboard response missing: {', '.join(missing)}")
+                return False
+            print(f"Selected career path: {response['selected_career_path']}")
+            print(f"Retrieved {len(response['recent_logs'])} progress logs")
+            return True
+        return False
+        
     def test_get_survey_questions(self):
         """Test getting survey questions"""
         success, response = self.run_test(
@@ -309,6 +412,58 @@ class NextObjectiveAPITester:
             print(f"Retrieved {len(response['questions'])} survey questions")
             return True
         return False
+
+    def test_catalog_conditional_get(self):
+        """Test that static catalogs carry an ETag and answer conditional requests with 304"""
+        self.tests_run += 1
+        print("\n🔍 Testing Catalog Conditional GET...")
+        
+        try:
+            for endpoint in ("survey-questions", "career-paths"):
+                url = f"{self.base_url}/api/{endpoint}"
+                response = requests.get(url)
+                etag = response.headers.get('ETag')
+                if response.status_code != 200 or not etag:
+                    print(f"❌ Failed - {endpoint} returned {response.status_code} without an ETag")
+                    return False
+                
+                revalidated = requests.get(url, headers={'If-None-Match': etag})
+                if revalidated.status_code != 304:
+                    print(f"❌ Failed - Expected 304 for {endpoint}, got {revalidated.status_code}")
+                    return False
+                print(f"{endpoint}: ETag {etag}, Cache-Control {response.headers.get('Cache-Control')}")
+            
+            self.tests_passed += 1
+            print("✅ Passed - Catalogs revalidate with 304")
+            return True
+        except Exception as e:
+            print(f"❌ Failed - Error: {str(e)}")
+            return False
+        
+    def test_metrics(self):
+        """Test that the Prometheus endpoint exposes route, LLM and fallback metrics"""
+        self.tests_run += 1
+        print("\n🔍 Testing Prometheus Metrics...")
+        
+        try:
+            response = requests.get(f"{self.base_url}/api/metrics")
+            if response.status_code != 200:
+                print(f"❌ Failed - Expected 200, got {response.status_code}")
+                return False
+            
+            expected = ("nextobjective_http_request_duration_seconds", "nextobjective_llm_call_duration_seconds",
+                        "nextobjective_mongo_operation_duration_seconds", "nextobjective_fallback")
+            missing = [name for name in expected if name not in response.text]
+            if missing:
+                print(f"❌ Failed - Missing metrics: {missing}")
+                return False
+            
+            self.tests_passed += 1
+            print("✅ Passed - Metrics exposed")
+            return True
+        except Exception as e:
+            print(f"❌ Failed - Error: {str(e)}")
+            return False
         
     def test_submit_survey(self):
         """Test submitting survey responses"""
@@ -434,6 +589,24 @@ class NextObjectiveAPITester:
             return True
         return False
 
+    def test_search_jobs(self):
+        """Test ranked job search for the selected career path and the user's skills"""
+        success, response = self.run_test(
+            "Search Jobs",
+            "GET",
+            f"jobs/search?career_path={self.selected_career_path}&user_id={self.user_id}&limit=5",
+            200
+        )
+        
+        if success and 'jobs' in response:
+            print(f"Retrieved {len(response['jobs'])} of {response.get('indexed_jobs', 0)} indexed jobs")
+            scores = [job['score'] for job in response['jobs']]
+            if scores != sorted(scores, reverse=True):
+                print("❌ Job search results are not ordered by score")
+                return False
+            return True
+        return False
+
 def main():
     # Setup
     tester = NextObjectiveAPITester()
@@ -460,10 +633,18 @@ def main():
         print("❌ Resume upload failed")
         return 1
     
+    # Test streaming resume upload
+    if not tester.test_upload_resume_stream():
+        print("❌ Streaming resume upload failed")
+    
     # Test getting survey questions
     if not tester.test_get_survey_questions():
         print("❌ Getting survey questions failed")
     
+    # Test catalog caching headers
+    if not tester.test_catalog_conditional_get():
+        print("❌ Catalog conditional GET failed")
+    
     # Test submitting survey
     if not tester.test_submit_survey():
         print("❌ Submitting survey failed")
@@ -480,6 +661,10 @@ def main():
     if not tester.test_calculate_career_score():
         print("❌ Career score calculation failed")
     
+    # Test batch career score calculation
+    if not tester.test_calculate_career_scores_batch():
+        print("❌ Batch career score calculation failed")
+    
     # Test adding progress log
     if not tester.test_add_progress_log():
         print("❌ Adding progress log failed")
@@ -488,10 +673,22 @@ def main():
     if not tester.test_get_user_progress():
         print("❌ Getting user progress failed")
     
+    # Test getting the combined dashboard
+    if not tester.test_get_user_dashboard():
+        print("❌ Getting user dashboard failed")
+    
     # Test getting job listings
     if not tester.test_get_job_listings():
         print("❌ Getting job listings failed")
     
+    # Test ranked job search
+    if not tester.test_search_jobs():
+        print("❌ Job search failed")
+    
+    # Test the metrics surface after the other endpoints have been exercised
+    if not tester.test_metrics():
+        print("❌ Metrics failed")
+    
     # Print results
     print(f"\n📊 Tests passed: {tester.tests_passed}/{tester.tests_run}")
     
@@ -71,6 +71,47 @@ function App() {
     }
   };
 
+  const waitForAnalysisJob = (jobId) => new Promise((resolve, reject) => {
+    const events = new EventSource(`${API_BASE_URL}/api/analysis-jobs/${jobId}/events`);
+    events.addEventListener('result', (event) => {
+      events.close();
+      const job = JSON.parse(event.data);
+      if (job.status === 'done') {
+        resolve(job.analysis);
+      } else {
+        reject(new Error(job.error || 'Resume analysis failed'));
+      }
+    });
+    events.addEventListener('timeout', () => {
+      events.close();
+      reject(new Error('Resume analysis timed out'));
+    });
+    events.onerror = () => {
+      events.close();
+      reject(new Error('Lost connection while analyzing resume'));
+    };
+  });
+
+  const applyRefinedAnalysis = (refined) => {
+    if (refined && refined.analysis_tier === 'llm') {
+      setResumeAnalysis((current) => (current && current.id === refined.id ? refined : current));
+    }
+  };
+
+  const readNdjsonStream = async (response, onMessage) => {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffered += decoder.decode(value, { stream: true });
+      const lines = buffered.split('\n');
+      buffered = lines.pop();
+      lines.filter((line) => line.trim()).forEach((line) => onMessage(JSON.parse(line)));
+    }
+  };
+
   const handleResumeUpload = async (event) => {
     const file = event.target.files[0];
     if (!file) return;
@@ -80,18 +121,53 @@ function App() {
     formData.append('file', file);
     formData.append('user_id', userId);
 
+    let localAnalysis = null;
+    let streamedSuggestions = [];
+    // Only touch the analysis this upload produced; the user may have moved on to enhanced suggestions
+    const updateUploadedAnalysis = (update) => {
+      setResumeAnalysis((current) => (current && localAnalysis && current.id === localAnalysis.id ? update(current) : current));
+    };
+
     try {
-      const response = await fetch(`${API_BASE_URL}/api/upload-resume`, {
+      const response = await fetch(`${API_BASE_URL}/api/upload-resume/stream`, {
         method: 'POST',
+        headers: { Accept: 'application/x-ndjson' },
         body: formData
       });
-      const analysis = await response.json();
-      setResumeAnalysis(analysis);
-      setIsEnhancedSuggestions(false); // Standard analysis, not enhanced
-      setCurrentStep('post-upload-choice');
+      if (!response.ok) {
+        throw new Error(`Upload failed with status ${response.status}`);
+      }
+
+      // The offline analysis arrives first, then LLM suggestions one by one, then the final LLM analysis
+      await readNdjsonStream(response, (message) => {
+        if (message.event === 'analysis' && !localAnalysis) {
+          localAnalysis = message.analysis;
+          setResumeAnalysis(message.analysis);
+          setIsEnhancedSuggestions(false); // Standard analysis, not enhanced
+          setCurrentStep('post-upload-choice');
+          setLoading(false);
+        } else if (message.event === 'suggestion') {
+          streamedSuggestions = [...streamedSuggestions, message.suggestion];
+          const suggestions = streamedSuggestions;
+          updateUploadedAnalysis((current) => ({ ...current, career_suggestions: suggestions }));
+        } else if (message.event === 'analysis') {
+          applyRefinedAnalysis(message.analysis);
+        } else if (message.event === 'final') {
+          updateUploadedAnalysis(() => localAnalysis);
+        } else if (message.event === 'refinement') {
+          updateUploadedAnalysis(() => localAnalysis);
+          waitForAnalysisJob(message.job_id)
+            .then(applyRefinedAnalysis)
+            .catch((error) => console.error('Error refining resume analysis:', error));
+        }
+      });
     } catch (error) {
       console.error('Error uploading resume:', error);
-      alert('Error analyzing resume. Please try again.');
+      if (!localAnalysis) {
+        alert('Error analyzing resume. Please try again.');
+      } else {
+        updateUploadedAnalysis(() => localAnalysis);
+      }
     } finally {
       setLoading(false);
     }
@@ -0,0 +1,83 @@
+"""Compare the sequential per-user reads the frontend triggers today with the single dashboard endpoint.
+
+Needs the MongoDB configured in backend/.env. Seeds a throwaway user, times both paths and
+removes the seeded documents again. Run from the repository root:
+    python scripts/bench_dashboard.py [iterations]
+"""
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.server import db, get_user_dashboard, get_user_progress  # noqa: E402
+
+SEEDED_COLLECTIONS = ("resume_analyses", "survey_responses", "career_scores", "user_score_summaries",
+                      "progress_logs", "career_selections")
+
+
+async def seed(user_id):
+    now = datetime.utcnow()
+    await db.resume_analyses.insert_one({
+        "id": str(uuid.uuid4()), "user_id": user_id, "timestamp": now, "experience_level": "Mid Level",
+        "extracted_skills": ["Python", "SQL", "Communication"],
+        "career_suggestions": [{"career_path": "Data Scientist", "match_score": 0.8, "reasoning": "x" * 400,
+                                "key_skills": ["Python"]}] * 3
+    })
+    await db.survey_responses.insert_one({"user_id": user_id, "timestamp": now,
+                                          "responses": {str(i): "Remote" for i in range(1, 11)}})
+    await db.career_scores.insert_one({"id": str(uuid.uuid4()), "user_id": user_id, "career_path": "Data Scientist",
+                                       "current_score": 70, "skill_gaps": ["ML"], "strength_areas": ["SQL"],
+                                       "recommendations": ["Course"], "timestamp": now})
+    await db.progress_logs.insert_many([
+        {"id": str(uuid.uuid4()), "user_id": user_id, "career_path": "Data Scientist", "log_entry": "y" * 300,
+         "activities_completed": ["a"], "skills_improved": ["b"], "timestamp": now}
+        for _ in range(25)
+    ])
+    await db.career_selections.insert_one({"user_id": user_id, "selected_career_path": "Data Scientist",
+                                           "timestamp": now})
+
+
+async def sequential_reads(user_id):
+    latest_first = [("timestamp", -1)]
+    progress = await get_user_progress(user_id)
+    analysis = await db.resume_analyses.find_one({"user_id": user_id}, sort=latest_first)
+    survey = await db.survey_responses.find_one({"user_id": user_id}, sort=latest_first)
+    selection = await db.career_selections.find_one({"user_id": user_id}, sort=latest_first)
+    return progress, analysis, survey, selection
+
+
+async def timed(call, user_id, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call(user_id)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), sorted(samples)[int(len(samples) * 0.95) - 1]
+
+
+async def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    user_id = f"bench-{uuid.uuid4()}"
+    await seed(user_id)
+    try:
+        await sequential_reads(user_id)
+        await get_user_dashboard(user_id)
+        seq_p50, seq_p95 = await timed(sequential_reads, user_id, iterations)
+        dash_p50, dash_p95 = await timed(get_user_dashboard, user_id, iterations)
+    finally:
+        for name in SEEDED_COLLECTIONS:
+            await db[name].delete_many({"user_id": user_id})
+
+    print(f"iterations:       {iterations}")
+    print(f"sequential reads: p50 {seq_p50:.2f} ms, p95 {seq_p95:.2f} ms")
+    print(f"dashboard:        p50 {dash_p50:.2f} ms, p95 {dash_p95:.2f} ms")
+    print(f"p50 reduction:    {(1 - dash_p50 / seq_p50) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,197 @@
+"""Benchmark the per-resume fallback analysis against the batch path.
+
+The pre-batch fallback is timed too, as the reference any speedup is measured against. Its
+suggestions predate the skill-profile matcher, so only the other two are checked for parity.
+
+Run from the repository root:
+    python scripts/bench_fallback.py [resume_count]
+"""
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.server import (  # noqa: E402
+    FALLBACK_KEYWORD_CATEGORIES,
+    generate_intelligent_fallback,
+    generate_intelligent_fallback_batch,
+)
+
+FILLER = ("responsible", "delivered", "stakeholders", "quarterly", "reports", "customers",
+          "improved", "process", "across", "teams", "built", "maintained", "internal", "tools")
+
+
+def baseline_fallback(resume_text):
+    """generate_intelligent_fallback as it was before the batch scorer, kept as the throughput reference"""
+    resume_lower = resume_text.lower()
+
+    # Analyze resume content for keywords
+    tech_keywords = ["software", "developer", "programming", "python", "javascript", "react", "coding", "technical", "engineer", "development"]
+    business_keywords = ["management", "business", "analyst", "strategy", "operations", "project", "marketing", "sales"]
+    creative_keywords = ["design", "creative", "marketing", "content", "writing", "visual", "graphic", "ux", "ui"]
+    data_keywords = ["data", "analytics", "analysis", "statistics", "research", "science", "machine learning", "ai"]
+    leadership_keywords = ["lead", "manager", "director", "team", "leadership", "supervisor", "coordinator"]
+
+    # Count keyword matches
+    tech_score = sum(1 for keyword in tech_keywords if keyword in resume_lower)
+    business_score = sum(1 for keyword in business_keywords if keyword in resume_lower)
+    creative_score = sum(1 for keyword in creative_keywords if keyword in resume_lower)
+    data_score = sum(1 for keyword in data_keywords if keyword in resume_lower)
+    leadership_score = sum(1 for keyword in leadership_keywords if keyword in resume_lower)
+
+    # Determine experience level
+    years_match = re.search(r'(\d+)\s*(?:years?|yrs?)', resume_lower)
+    if years_match:
+        years = int(years_match.group(1))
+        if years < 2:
+            experience_level = "Entry Level"
+        elif years < 5:
+            experience_level = "Mid Level"
+        else:
+            experience_level = "Senior Level"
+    else:
+        experience_level = "Mid Level"
+
+    # Generate suggestions based on keyword analysis
+    suggestions = []
+
+    # Tech-focused suggestions
+    if tech_score >= 3:
+        suggestions.append({
+            "career_path": "Software Engineer" if experience_level != "Entry Level" else "Junior Software Developer",
+            "match_score": 0.85 + (tech_score * 0.02),
+            "reasoning": f"Strong technical background with {tech_score} relevant technical skills mentioned",
+            "key_skills": ["Programming", "Problem Solving", "Technical Skills"]
+        })
+
+    # Data-focused suggestions
+    if data_score >= 2 or tech_score >= 2:
+        suggestions.append({
+            "career_path": "Data Analyst" if experience_level != "Senior Level" else "Senior Data Scientist",
+            "match_score": 0.78 + (data_score * 0.03),
+            "reasoning": f"Analytical capabilities with {data_score + tech_score} relevant technical and analytical skills",
+            "key_skills": ["Data Analysis", "Problem Solving", "Technical Skills"]
+        })
+
+    # Business/Management suggestions
+    if business_score >= 2 or leadership_score >= 2:
+        suggestions.append({
+            "career_path": "Business Analyst" if experience_level != "Senior Level" else "Product Manager",
+            "match_score": 0.75 + (business_score * 0.02),
+            "reasoning": f"Business acumen with {business_score + leadership_score} relevant business and leadership skills",
+            "key_skills": ["Analysis", "Communication", "Business Strategy"]
+        })
+
+    # Creative suggestions
+    if creative_score >= 2:
+        suggestions.append({
+            "career_path": "UX Designer" if tech_score > 0 else "Marketing Coordinator",
+            "match_score": 0.72 + (creative_score * 0.03),
+            "reasoning": f"Creative skills with {creative_score} relevant creative and design skills",
+            "key_skills": ["Design", "Creativity", "Communication"]
+        })
+
+    # Leadership suggestions
+    if leadership_score >= 3 and experience_level == "Senior Level":
+        suggestions.append({
+            "career_path": "Project Manager",
+            "match_score": 0.80 + (leadership_score * 0.02),
+            "reasoning": f"Strong leadership background with {leadership_score} relevant management skills",
+            "key_skills": ["Leadership", "Project Management", "Communication"]
+        })
+
+    # Ensure we have at least 3 suggestions
+    default_suggestions = [
+        {
+            "career_path": "Business Development Representative",
+            "match_score": 0.68,
+            "reasoning": "Versatile professional skills suitable for business development",
+            "key_skills": ["Communication", "Sales", "Relationship Building"]
+        },
+        {
+            "career_path": "Operations Coordinator",
+            "match_score": 0.65,
+            "reasoning": "Organizational skills suitable for operations management",
+            "key_skills": ["Organization", "Process Improvement", "Communication"]
+        },
+        {
+            "career_path": "Customer Success Manager",
+            "match_score": 0.62,
+            "reasoning": "People skills and problem-solving abilities for customer success",
+            "key_skills": ["Customer Service", "Problem Solving", "Communication"]
+        }
+    ]
+
+    # Add default suggestions if needed
+    while len(suggestions) < 3:
+        suggestions.append(default_suggestions[len(suggestions)])
+
+    # Sort by match score and take top 3
+    suggestions.sort(key=lambda x: x["match_score"], reverse=True)
+    suggestions = suggestions[:3]
+
+    # Extract skills from resume
+    all_skills = ["Communication", "Problem Solving", "Leadership"]
+    if tech_score > 0:
+        all_skills.extend(["Technical Skills", "Programming"])
+    if business_score > 0:
+        all_skills.extend(["Business Analysis", "Strategy"])
+    if creative_score > 0:
+        all_skills.extend(["Design", "Creativity"])
+    if data_score > 0:
+        all_skills.extend(["Data Analysis", "Research"])
+
+    return {
+        "career_suggestions": suggestions,
+        "extracted_skills": list(set(all_skills))[:6],  # Limit to 6 unique skills
+        "experience_level": experience_level
+    }
+
+
+def synthetic_resumes(count, seed=7):
+    rng = random.Random(seed)
+    keywords = [keyword for words in FALLBACK_KEYWORD_CATEGORIES.values() for keyword in words]
+    resumes = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(150, 400))]
+        words += [rng.choice(keywords).title() for _ in range(rng.randint(0, 25))]
+        rng.shuffle(words)
+        words.append(f"{rng.randint(0, 15)} years of experience")
+        resumes.append(" ".join(words))
+    return resumes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    resumes = synthetic_resumes(count)
+
+    started = time.perf_counter()
+    for text in resumes:
+        baseline_fallback(text)
+    baseline_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    single = [generate_intelligent_fallback(text) for text in resumes]
+    single_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = generate_intelligent_fallback_batch(resumes)
+    batch_seconds = time.perf_counter() - started
+
+    if single != batch:
+        mismatches = sum(1 for a, b in zip(single, batch) if a != b)
+        raise SystemExit(f"Batch results differ from per-resume results for {mismatches} resumes")
+
+    print(f"resumes:     {count}")
+    print(f"baseline:    {baseline_seconds:.3f}s ({count / baseline_seconds:,.0f} resumes/s)")
+    print(f"per-resume:  {single_seconds:.3f}s ({count / single_seconds:,.0f} resumes/s)")
+    print(f"batch:       {batch_seconds:.3f}s ({count / batch_seconds:,.0f} resumes/s)")
+    print(f"speedup:     {baseline_seconds / batch_seconds:.1f}x over baseline, "
+          f"{single_seconds / batch_seconds:.1f}x over per-resume")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Build, persist, reload and query the job search index over a synthetic feed.
+
+Writes the synthetic feed and index to a temporary directory, so nothing in the repository changes.
+To index a real feed instead, start the backend with JOB_FEED_PATH pointing at the JSONL file.
+Run from the repository root:
+    python scripts/bench_job_search.py [job_count] [query_count]
+"""
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.server import CAREER_PATHS, FALLBACK_KEYWORD_CATEGORIES, JobSearchIndex  # noqa: E402
+
+FILLER = ("responsible", "delivered", "stakeholders", "quarterly", "reports", "customers", "improved",
+          "process", "across", "teams", "built", "maintained", "internal", "tools", "fast", "paced")
+COMPANIES = ("Tech Corp", "Innovation Inc", "Growth LLC", "Acme", "Globex", "Initech")
+SENIORITY = ("Junior", "Senior", "Lead", "Principal", "")
+
+
+def synthetic_feed(path, count, seed=11):
+    rng = random.Random(seed)
+    keywords = [keyword for words in FALLBACK_KEYWORD_CATEGORIES.values() for keyword in words]
+    with open(path, "wb") as feed:
+        for number in range(count):
+            career_path = rng.choice(CAREER_PATHS)
+            skills = rng.sample(keywords, 6)
+            words = [rng.choice(FILLER) for _ in range(rng.randint(60, 160))] + skills
+            rng.shuffle(words)
+            feed.write(orjson.dumps({
+                "title": f"{rng.choice(SENIORITY)} {career_path}".strip(),
+                "company": rng.choice(COMPANIES),
+                "location": "Remote",
+                "description": " ".join(words),
+                "requirements": [f"{rng.randint(1, 8)}+ years experience", *skills[:3]],
+                "url": f"https://example.com/jobs/{number}",
+                "career_path": career_path
+            }) + b"\n")
+
+
+def main():
+    job_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rng = random.Random(3)
+    keywords = [keyword for words in FALLBACK_KEYWORD_CATEGORIES.values() for keyword in words]
+
+    with tempfile.TemporaryDirectory() as directory:
+        feed_path, index_path = f"{directory}/feed.jsonl", f"{directory}/job_index.npz"
+        synthetic_feed(feed_path, job_count)
+
+        started = time.perf_counter()
+        index = JobSearchIndex.from_jsonl(feed_path)
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index.save(index_path)
+        save_seconds = time.perf_counter() - started
+        index_bytes = Path(index_path).stat().st_size
+
+        started = time.perf_counter()
+        loaded = JobSearchIndex.load(index_path)
+        load_seconds = time.perf_counter() - started
+
+    queries = [(rng.choice(CAREER_PATHS), rng.sample(keywords, 8)) for _ in range(query_count)]
+    for career_path, skills in queries[:20]:
+        if loaded.search(career_path, skills) != index.search(career_path, skills):
+            raise SystemExit("Reloaded index ranks differently from the one it was saved from")
+
+    samples = []
+    for career_path, skills in queries:
+        started = time.perf_counter()
+        loaded.search(career_path, skills, limit=10)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    print(f"jobs:        {len(loaded):,} ({len(loaded.term_ids):,} terms)")
+    print(f"ingest:      {build_seconds:.2f}s ({job_count / build_seconds:,.0f} jobs/s)")
+    print(f"save:        {save_seconds:.2f}s ({index_bytes / 1e6:.1f} MB)")
+    print(f"load:        {load_seconds:.2f}s")
+    print(f"search:      p50 {statistics.median(samples):.2f} ms, p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
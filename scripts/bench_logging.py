@@ -0,0 +1,68 @@
+"""Per-call cost, on the calling thread, of the old print tracing versus the queued structured logger.
+
+"before" prints a resume prefix, the full LLM reply, the extracted JSON and the parsed dict, as the AI helpers
+used to on every call. "after" makes the calls the helpers make now: one sampled, truncated payload record and
+one structured record. Output goes to stderr, so redirect it to keep the terminal readable. Run from the
+repository root:
+    python scripts/bench_logging.py [iterations] 2>/dev/null
+"""
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.server import log_payload, log_queue_handler, logger  # noqa: E402
+
+REPLY = json.dumps({
+    "career_suggestions": [{"career_path": f"Career {n}", "match_score": 0.8, "reasoning": "x" * 600,
+                            "key_skills": ["Python", "SQL", "Communication"]} for n in range(3)],
+    "extracted_skills": ["Python", "SQL", "Communication", "Leadership"],
+    "experience_level": "Mid Level"
+})
+RESUME = "Experienced analyst. " * 300
+
+
+def before():
+    print(f"Starting AI analysis for resume: {RESUME[:100]}...")
+    print(f"Received response from Claude: {REPLY[:200]}...")
+    print(f"Full response text: {REPLY}")
+    print(f"Extracted JSON: {REPLY}")
+    print(f"Parsed result: {json.loads(REPLY)}")
+
+
+def after():
+    log_payload("LLM reply", REPLY, purpose="resume_analysis", resume_chars=len(RESUME))
+    logger.info("Resume analysis refined", extra={"fields": {"purpose": "resume_analysis", "reply_chars": len(REPLY)}})
+
+
+def timed(call, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples), sorted(samples)[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    logging.getLogger().setLevel(logging.DEBUG)
+    # /dev/null is the cheapest stdout there is; a container's log pipe only makes "before" slower
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        before_p50, before_p99 = timed(before, iterations)
+    after_p50, after_p99 = timed(after, iterations)
+
+    print(f"iterations:      {iterations}")
+    print(f"print tracing:   p50 {before_p50:.1f} us, p99 {before_p99:.1f} us")
+    print(f"queued logging:  p50 {after_p50:.1f} us, p99 {after_p99:.1f} us")
+    print(f"dropped records: {log_queue_handler.dropped}")
+
+
+if __name__ == "__main__":
+    main()
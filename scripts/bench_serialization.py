@@ -0,0 +1,104 @@
+"""Compare response size and serialization time of whole documents against projected, slim responses.
+
+"before" is what the endpoints used to return: whole MongoDB documents (ObjectId stringified) encoded with
+jsonable_encoder and the standard JSON encoder. "after" is the projected document validated into the lean
+response model and rendered by the router's orjson response class. No database is needed. Run from the
+repository root:
+    python scripts/bench_serialization.py [iterations]
+"""
+import json
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.server import (  # noqa: E402
+    ANALYSIS_SUMMARY_PROJECTION,
+    LOG_PROJECTION,
+    SURVEY_PROJECTION,
+    DashboardResponse,
+    UserProgressResponse,
+)
+
+
+def stored_documents():
+    """Documents shaped like the ones the backend writes, with a few fields the frontend never reads"""
+    user_id = str(uuid.uuid4())
+    now = datetime.utcnow()
+    analysis = {
+        "_id": ObjectId(), "id": str(uuid.uuid4()), "user_id": user_id, "timestamp": now,
+        "experience_level": "Mid Level", "resume_text_hash": "0" * 64,
+        "extracted_skills": ["Python", "SQL", "Communication", "Leadership", "Excel", "Tableau"],
+        "career_suggestions": [{"career_path": "Data Scientist", "match_score": 0.8, "reasoning": "x" * 400,
+                                "key_skills": ["Python", "Statistics"], "preference_match": "y" * 120}] * 3
+    }
+    survey = {"_id": ObjectId(), "user_id": user_id, "timestamp": now,
+              "responses": {str(i): "Remote" for i in range(1, 11)}}
+    career_score = {"id": str(uuid.uuid4()), "user_id": user_id, "career_path": "Data Scientist",
+                    "current_score": 70.0, "max_score": 100.0, "skill_gaps": ["ML"], "strength_areas": ["SQL"],
+                    "recommendations": ["Course"], "timestamp": now}
+    logs = [
+        {"_id": ObjectId(), "id": str(uuid.uuid4()), "user_id": user_id, "career_path": "Data Scientist",
+         "log_entry": "z" * 300, "activities_completed": ["a"], "skills_improved": ["b"], "timestamp": now}
+        for _ in range(10)
+    ]
+    return analysis, survey, career_score, logs
+
+
+def project(document, projection):
+    return {key: value for key, value in document.items() if projection.get(key, 0)}
+
+
+def render_before(analysis, survey, career_score, logs):
+    logs = [{**log, "_id": str(log["_id"])} for log in logs]
+    analysis = {**analysis, "_id": str(analysis["_id"])}
+    survey = {**survey, "_id": str(survey["_id"])}
+    progress = {"career_score": career_score, "recent_logs": logs}
+    dashboard = {"analysis": analysis, "survey": survey, "career_score": career_score, "recent_logs": logs,
+                 "selected_career_path": "Data Scientist"}
+    return [JSONResponse(jsonable_encoder(body)).body for body in (progress, dashboard)]
+
+
+def render_after(analysis, survey, career_score, logs):
+    logs = [project(log, LOG_PROJECTION) for log in logs]
+    progress = UserProgressResponse(career_score=career_score, recent_logs=logs)
+    dashboard = DashboardResponse(
+        analysis=project(analysis, ANALYSIS_SUMMARY_PROJECTION),
+        survey=project(survey, SURVEY_PROJECTION),
+        career_score=career_score,
+        recent_logs=logs,
+        selected_career_path="Data Scientist"
+    )
+    return [ORJSONResponse(body.model_dump(mode="json")).body for body in (progress, dashboard)]
+
+
+def timed(render, documents, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        render(*documents)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    documents = stored_documents()
+    before, after = render_before(*documents), render_after(*documents)
+    for body in after:
+        json.loads(body)  # the slim payload must still be valid JSON
+    before_us, after_us = timed(render_before, documents, iterations), timed(render_after, documents, iterations)
+
+    print(f"iterations:          {iterations}")
+    for name, old, new in zip(("user-progress", "dashboard"), before, after):
+        print(f"{name + ' bytes:':<21}{len(old):,} -> {len(new):,} ({(1 - len(new) / len(old)) * 100:.0f}% smaller)")
+    print(f"serialize both:      {before_us:.1f} us -> {after_us:.1f} us ({before_us / after_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Time-to-first-suggestion of the streaming upload compared with waiting for the whole analysis.
+
+Needs a running backend, ideally pointed at scripts/llm_stub_server.py so the LLM latency is controlled.
+Each run uploads a unique resume so the analysis cache is not hit. Run from the repository root:
+    python scripts/bench_streaming.py [base_url] [runs]
+"""
+import json
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+
+RESUME = "Software engineer with Python, SQL, Docker and AWS. Led a team of four. 6 years of experience. Ref {}"
+
+
+def timed_upload(client):
+    started = time.perf_counter()
+    marks = {}
+    files = {"file": ("resume.txt", RESUME.format(uuid.uuid4()).encode(), "text/plain")}
+    with client.stream("POST", "/api/upload-resume/stream", data={"user_id": "bench"}, files=files,
+                       headers={"Accept": "application/x-ndjson"}) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)["event"]
+            key = "local" if event == "analysis" and "local" not in marks else event
+            marks.setdefault(key, time.perf_counter() - started)
+    marks["done"] = time.perf_counter() - started
+    return marks
+
+
+def main():
+    base_url = sys.argv[1] if len(sys.argv) > 1 else "http://127.0.0.1:8001"
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with httpx.Client(base_url=base_url, timeout=300) as client:
+        results = [timed_upload(client) for _ in range(runs)]
+
+    for label, key in (("local analysis", "local"), ("first suggestion", "suggestion"), ("complete", "done")):
+        samples = [marks[key] for marks in results if key in marks]
+        if samples:
+            print(f"{label + ':':<18} median {statistics.median(samples):.2f}s over {len(samples)} runs")
+
+
+if __name__ == "__main__":
+    main()
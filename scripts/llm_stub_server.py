@@ -0,0 +1,92 @@
+"""Minimal Anthropic Messages API stand-in for load testing the backend without real LLM calls.
+
+Run with:
+    uvicorn scripts.llm_stub_server:app --port 9100
+and start the backend with LLM_BACKEND=http LLM_BASE_URL=http://127.0.0.1:9100
+
+STUB_LATENCY_SECONDS controls how long each reply takes (default 1.0). Requests with "stream": true get the
+same reply as Messages API server-sent events, spread evenly over that time in STUB_STREAM_CHUNK_CHARS pieces.
+"""
+import asyncio
+import json
+import os
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+STUB_LATENCY_SECONDS = float(os.environ.get('STUB_LATENCY_SECONDS', '1.0'))
+STUB_STREAM_CHUNK_CHARS = int(os.environ.get('STUB_STREAM_CHUNK_CHARS', '16'))
+
+ANALYSIS_REPLY = {
+    "career_suggestions": [
+        {
+            "career_path": "Software Engineer",
+            "match_score": 0.86,
+            "reasoning": "Stub reasoning for load testing",
+            "key_skills": ["Python", "APIs", "Testing"],
+            "preference_match": "Stub preference alignment"
+        },
+        {
+            "career_path": "Data Scientist",
+            "match_score": 0.78,
+            "reasoning": "Stub reasoning for load testing",
+            "key_skills": ["Statistics", "Python", "SQL"],
+            "preference_match": "Stub preference alignment"
+        },
+        {
+            "career_path": "Product Manager",
+            "match_score": 0.71,
+            "reasoning": "Stub reasoning for load testing",
+            "key_skills": ["Strategy", "Communication", "Roadmapping"],
+            "preference_match": "Stub preference alignment"
+        }
+    ],
+    "extracted_skills": ["Python", "SQL", "Communication", "Leadership"],
+    "experience_level": "Mid Level"
+}
+
+SCORE_REPLY = {
+    "current_score": 72,
+    "skill_gaps": ["Stub gap one", "Stub gap two"],
+    "strength_areas": ["Stub strength"],
+    "recommendations": ["Stub recommendation"]
+}
+
+app = FastAPI()
+
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps({'type': event, **data})}\n\n"
+
+
+async def stream_reply(text, input_tokens):
+    chunks = [text[i:i + STUB_STREAM_CHUNK_CHARS] for i in range(0, len(text), STUB_STREAM_CHUNK_CHARS)]
+    yield sse("message_start", {"message": {"id": "msg_stub", "type": "message", "role": "assistant", "content": [],
+                                         "usage": {"input_tokens": input_tokens, "output_tokens": 1}}})
+    yield sse("content_block_start", {"index": 0, "content_block": {"type": "text", "text": ""}})
+    for chunk in chunks:
+        await asyncio.sleep(STUB_LATENCY_SECONDS / len(chunks))
+        yield sse("content_block_delta", {"index": 0, "delta": {"type": "text_delta", "text": chunk}})
+    yield sse("content_block_stop", {"index": 0})
+    yield sse("message_delta", {"delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": len(text) // 4}})
+    yield sse("message_stop", {})
+
+
+@app.post("/v1/messages")
+async def create_message(request: Request):
+    body = await request.json()
+    prompt = body["messages"][-1]["content"]
+    reply = ANALYSIS_REPLY if "career_suggestions" in prompt else SCORE_REPLY
+    text = json.dumps(reply)
+    if body.get("stream"):
+        return StreamingResponse(stream_reply(text, len(prompt) // 4), media_type="text/event-stream")
+    await asyncio.sleep(STUB_LATENCY_SECONDS)
+    return {
+        "id": "msg_stub",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4}
+    }
@@ -0,0 +1,40 @@
+import pytest
+
+from backend.server import CAREER_PATHS, CAREER_SKILL_MATCHER, CAREER_SKILL_PROFILES, generate_intelligent_fallback
+
+
+def test_every_career_path_has_a_skill_profile():
+    assert set(CAREER_SKILL_PROFILES) == set(CAREER_PATHS)
+
+
+@pytest.mark.parametrize("resume, career", [
+    ("Built CI/CD pipelines with Docker, Kubernetes and Terraform on AWS", "DevOps Engineer"),
+    ("Trained PyTorch and TensorFlow models and owned model deployment with MLOps tooling", "Machine Learning Engineer"),
+    ("Front end work in HTML, CSS and React with responsive design for WordPress sites", "Web Developer"),
+    ("Ran facilitation and instructional design for onboarding, built e-learning in our LMS", "Training Specialist"),
+])
+def test_profile_careers_rank_first_for_matching_resumes(resume, career):
+    assert CAREER_SKILL_MATCHER.rank(resume)[0][0] == career
+
+
+def test_matcher_is_skipped_when_keyword_rules_fill_every_slot(monkeypatch):
+    calls = []
+    monkeypatch.setattr(CAREER_SKILL_MATCHER, "phrase_counts", lambda text: calls.append(text) or {})
+    resume = ("Senior software engineer and team lead, 8 years of python, javascript and react development, "
+              "data analytics and statistics research, business strategy and project management")
+
+    analysis = generate_intelligent_fallback(resume)
+
+    assert len(analysis["career_suggestions"]) == 3
+    assert calls == []
+
+
+def test_matcher_counts_phrases_once_when_a_slot_is_open(monkeypatch):
+    calls = []
+    phrase_counts = CAREER_SKILL_MATCHER.phrase_counts
+    monkeypatch.setattr(CAREER_SKILL_MATCHER, "phrase_counts", lambda text: calls.append(text) or phrase_counts(text))
+
+    analysis = generate_intelligent_fallback("Built CI/CD pipelines with Docker, Kubernetes and Terraform on AWS")
+
+    assert analysis["career_suggestions"][0]["career_path"] == "DevOps Engineer"
+    assert len(calls) == 1
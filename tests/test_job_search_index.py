@@ -0,0 +1,29 @@
+from backend.server import JobSearchIndex
+
+
+def test_invalid_records_are_skipped_not_fatal(tmp_path):
+    feed = tmp_path / "jobs.jsonl"
+    feed.write_text(
+        '{"title": 123}\n'
+        '{"title": "Data Analyst", "requirements": ["SQL", "Tableau"]}\n'
+        '{"title": "Bad Requirements", "requirements": 5}\n'
+    )
+
+    index = JobSearchIndex.from_jsonl(str(feed))
+
+    assert len(index) == 1
+    assert [job["title"] for job in index.search("Data Analyst")] == ["Data Analyst"]
+
+
+def test_saved_index_size_does_not_scale_with_the_longest_term(tmp_path):
+    records = [{"title": f"Analyst {n}", "description": f"term{n}"} for n in range(1000)]
+    records.append({"title": "Engineer", "description": "x" * 5000})
+    index = JobSearchIndex.build(records)
+    path = tmp_path / "job_index.npz"
+
+    index.save(str(path))
+    loaded = JobSearchIndex.load(str(path))
+
+    assert path.stat().st_size < 1_000_000
+    assert loaded.term_ids == index.term_ids
+    assert loaded.search("Engineer") == index.search("Engineer")
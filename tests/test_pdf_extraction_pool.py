@@ -0,0 +1,41 @@
+import asyncio
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import backend.server as server
+from backend.server import PdfExtractionPool
+
+
+def _hang(pdf_path, max_pages, max_chars):
+    time.sleep(60)
+
+
+def test_concurrent_timeouts_kill_the_workers_once(monkeypatch):
+    monkeypatch.setattr(server, "_extract_pdf_text_sync", _hang)
+    pool = PdfExtractionPool(max_workers=3, max_queue=0, timeout_seconds=3)
+
+    async def run():
+        tasks = [asyncio.create_task(pool.extract("resume.pdf", 1, 100)) for _ in range(3)]
+        await asyncio.sleep(0)
+        processes = list(pool._executor._processes.values())
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return processes, results
+
+    processes, results = asyncio.run(run())
+
+    assert all(isinstance(result, (asyncio.TimeoutError, BrokenProcessPool)) for result in results), results
+    assert any(isinstance(result, asyncio.TimeoutError) for result in results)
+    assert pool._executor is None
+    for process in processes:
+        process.join(timeout=5)
+        assert not process.is_alive()
+
+
+def test_terminating_an_already_killed_pool_is_a_no_op():
+    pool = PdfExtractionPool(max_workers=1, max_queue=0, timeout_seconds=1)
+    executor = pool._get_executor()
+
+    pool._terminate(executor)
+    pool._terminate(executor)
+
+    assert pool._executor is None
@@ -0,0 +1,35 @@
+import itertools
+
+from backend.server import (
+    CAREER_PATHS,
+    OFFLINE_CAREER_TITLES,
+    PREFERENCE_ALIGNMENT_RULES,
+    SURVEY_QUESTIONS,
+    calculate_preference_alignment,
+    compute_preference_alignment,
+)
+
+QUESTION_OPTIONS = {
+    str(question["id"]): question["options"]
+    for question in SURVEY_QUESTIONS
+    if str(question["id"]) in PREFERENCE_ALIGNMENT_RULES
+}
+
+
+def survey_combinations():
+    """Every combination of answers to the scored questions, including unanswered ones"""
+    question_ids = list(QUESTION_OPTIONS)
+    for answers in itertools.product(*[QUESTION_OPTIONS[qid] + [None] for qid in question_ids]):
+        yield {qid: answer for qid, answer in zip(question_ids, answers) if answer is not None}
+
+
+def test_table_matches_rules_for_every_career_and_answer_combination():
+    for career in CAREER_PATHS + OFFLINE_CAREER_TITLES:
+        for survey in survey_combinations():
+            assert calculate_preference_alignment(career, survey) == compute_preference_alignment(career, survey)
+
+
+def test_unknown_careers_and_free_text_answers_use_the_rules():
+    survey = {"1": "Remote", "3": "Large enterprise", "5": "In teams", "8": "Technology"}
+    for career in ["Senior Backend Developer", "Software Engineer", "Research Coordinator"]:
+        assert calculate_preference_alignment(career, survey) == compute_preference_alignment(career, survey)
@@ -0,0 +1,32 @@
+import threading
+import time
+
+from backend.server import RollingRateLimit, StackSampler
+
+
+def test_rolling_rate_limit_frees_slots_as_the_window_moves():
+    limit = RollingRateLimit(2, window_seconds=0.05)
+    assert [limit.try_acquire() for _ in range(3)] == [True, True, False]
+    time.sleep(0.06)
+    assert limit.try_acquire()
+
+
+def busy_wait_for_profiler(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampler_collapses_busy_stacks_and_skips_idle_threads():
+    idle = threading.Event()
+    parked = threading.Thread(target=idle.wait, name="parked")
+    parked.start()
+    sampler = StackSampler(0.001, threading.get_ident())
+    sampler.start()
+    busy_wait_for_profiler(0.1)
+    samples = sampler.stop()
+    idle.set()
+    parked.join()
+
+    assert any(stack.startswith("MainThread;") and "busy_wait_for_profiler" in stack for stack in samples)
+    assert not any(stack.startswith("parked;") for stack in samples)
@@ -0,0 +1,34 @@
+import pytest
+
+from backend.server import (
+    CareerScoreBatchPayload,
+    LlmOutputError,
+    ResumeAnalysisPayload,
+    StructuredOutputParser,
+)
+
+ANALYSIS_JSON = (
+    '{"career_suggestions": [{"career_path": "Data Analyst", "match_score": 0.8, '
+    '"reasoning": "Writes SQL like {SELECT} and says \\"}\\" a lot", "key_skills": ["SQL"]}], '
+    '"extracted_skills": ["SQL"], "experience_level": "Mid Level"}'
+)
+
+
+@pytest.mark.parametrize("reply", [
+    ANALYSIS_JSON,
+    f"```json\n{ANALYSIS_JSON}\n```",
+    f"Here is the analysis {{as requested}}:\n{ANALYSIS_JSON}\nLet me know {{if you need more",
+    f"Use the format {{\"career_path\": \"...\"}}. {{see below\n{ANALYSIS_JSON}",
+])
+def test_first_object_matching_the_model_is_returned(reply):
+    payload = StructuredOutputParser().parse(reply, ResumeAnalysisPayload, purpose="test")
+    assert payload.career_suggestions[0].reasoning == 'Writes SQL like {SELECT} and says "}" a lot'
+
+
+def test_failures_are_counted_per_purpose():
+    parser = StructuredOutputParser()
+    parser.parse('{"scores": []}', CareerScoreBatchPayload, purpose="batch")
+    for reply in ["I cannot help with that.", '{"scores": [{"career_path": "X"}]}', '{"scores": [']:
+        with pytest.raises(LlmOutputError):
+            parser.parse(reply, CareerScoreBatchPayload, purpose="batch")
+    assert parser.stats()["batch"] == {"parsed": 1, "recovered": 0, "failed": 3, "failure_rate": 0.75}